@@ -0,0 +1,46 @@
+"""
+Measures the construction of controls through the generated
+``__init__``.
+
+Usage: python benchmarks/construction.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screen.controls import Stack, Text
+from screen.drawing import Color
+
+
+def report(label, create, n):
+    best = None
+
+    for _ in range(3):
+        start = time.perf_counter()
+
+        for _ in range(n):
+            create()
+
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"{label:32} {best / n * 1e6:6.2f} us")
+
+
+def main():
+    color = Color(1)
+
+    report("Text(content)", lambda: Text(content="hello"), 100_000)
+    report(
+        "Text(content, 3 optional)",
+        lambda: Text(content="hello", foreground=color, layer=1, width=5),
+        100_000,
+    )
+    report("Stack(children=[Text])", lambda: Stack(children=[Text(content="a")]), 10_000)
+
+
+if __name__ == "__main__":
+    main()
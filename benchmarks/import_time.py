@@ -0,0 +1,96 @@
+"""
+Measures the import time of the library with ``python -X importtime``.
+
+Usage: python benchmarks/import_time.py [--runs N] [--baseline PATH]
+
+``--baseline`` compares against another checkout of the repository,
+for example one created with ``git worktree add``. Each checkout is
+byte-compiled first, so that compiling the sources is not measured.
+``-X importtime`` requires Python 3.7.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+statements = [
+    "import screen",
+    "import screen.controls",
+    "from screen.controls import Stack; Stack.__doc__",
+]
+
+
+def compile_sources(path):
+    # NOTE: the bytecode is written even when PYTHONDONTWRITEBYTECODE
+    #       is set, which would otherwise leave it outdated.
+    subprocess.run(
+        [sys.executable, "-m", "compileall", "-q", os.path.join(path, "screen")],
+        check=True,
+    )
+
+
+def measure(path, statement, runs):
+    totals = list()
+    own = list()
+
+    for _ in range(runs):
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        ).stderr
+
+        total = 0
+        screen = 0
+
+        # NOTE: each line is "import time: self | cumulative | name".
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+
+            (self_us, _, name) = line[len("import time:") :].split("|")
+            total += int(self_us)
+
+            if name.strip().startswith("screen"):
+                screen += int(self_us)
+
+        totals.append(total)
+        own.append(screen)
+
+    return (statistics.median(totals) / 1000, statistics.median(own) / 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=25)
+    parser.add_argument("--baseline")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = [("current", root)]
+
+    if args.baseline:
+        paths.insert(0, ("baseline", args.baseline))
+
+    for (_, path) in paths:
+        compile_sources(path)
+
+    print(f"median of {args.runs} runs, total (screen.* self time), ms")
+
+    for statement in statements:
+        results = []
+
+        for (label, path) in paths:
+            (total, screen) = measure(path, statement, args.runs)
+            results.append(f"{label} {total:6.1f} ({screen:4.1f})")
+
+        print(f"{statement:52} " + "   ".join(results))
+
+
+if __name__ == "__main__":
+    main()
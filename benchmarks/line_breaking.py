@@ -0,0 +1,64 @@
+"""
+Measures greedy and optimal line breaking, and the raggedness of the
+lines each produces.
+
+Usage: python benchmarks/line_breaking.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screen.controls.primitives import Boundary
+from screen.controls.text import _Paragraph
+
+
+def raggedness(paragraph, lines, w):
+    # NOTE: the last line does not count towards the raggedness.
+    columns = paragraph.columns
+    return sum((w - (columns[stop] - columns[start])) ** 2 for (start, stop, _) in lines[:-1])
+
+
+def main():
+    random.seed(0)
+
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(random.choices(letters, k=random.randint(1, 12))) for _ in range(500)]
+
+    print("size  width   greedy ms  raggedness   optimal ms  raggedness")
+
+    for size in (5_000, 20_000):
+        text = list()
+        length = 0
+
+        while length < size:
+            word = random.choice(words)
+            text.append(word)
+            length += len(word) + 1
+
+        text = " ".join(text)
+
+        for w in (40, 80, 120):
+            results = list()
+
+            for (boundary, method) in ((Boundary.word, "wrap"), (Boundary.optimal, "wrap_optimal")):
+                paragraph = _Paragraph(text, boundary)
+                wrap = getattr(paragraph, method)
+
+                n = 20
+                start = time.perf_counter()
+
+                for _ in range(n):
+                    lines = wrap(w)
+
+                elapsed = (time.perf_counter() - start) / n * 1e3
+                results.append(f"{elapsed:10.2f}  {raggedness(paragraph, lines, w):10}")
+
+            print(f"{size:5} {w:6} " + "   ".join(results))
+
+
+if __name__ == "__main__":
+    main()
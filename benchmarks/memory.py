@@ -0,0 +1,79 @@
+"""
+Measures the memory used per control with :mod:`tracemalloc`.
+
+Usage: python benchmarks/memory.py [--nodes N] [--baseline PATH]
+
+``--baseline`` compares against another checkout of the repository,
+for example one created with ``git worktree add``. Each checkout is
+measured in its own process.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+script = """
+import gc
+import sys
+import tracemalloc
+
+from screen.controls import Stack, Text
+
+n = int(sys.argv[1])
+
+gc.collect()
+tracemalloc.start()
+before = tracemalloc.get_traced_memory()[0]
+
+stack = Stack(children=[{} for _ in range(n)])
+
+gc.collect()
+print((tracemalloc.get_traced_memory()[0] - before) / n)
+"""
+
+
+controls = [
+    'Text(content="label")',
+    'Stack(children=[Text(content="label")])',
+]
+
+
+def measure(path, control, nodes):
+    stdout = subprocess.run(
+        [sys.executable, "-c", script.format(control), str(nodes)],
+        cwd=path,
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    ).stdout
+
+    return float(stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--baseline")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = [("current", root)]
+
+    if args.baseline:
+        paths.insert(0, ("baseline", args.baseline))
+
+    print(f"{args.nodes} controls under one Stack, bytes per child")
+
+    for control in controls:
+        results = []
+
+        for (label, path) in paths:
+            results.append(f"{label} {measure(path, control, args.nodes):6.1f}")
+
+        print(f"{control:42} " + "   ".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measures the property type validators against walking the typing
+annotation with ``isinstance`` on every check.
+
+Usage: python benchmarks/validators.py
+"""
+
+from typing import List, Optional
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from screen.controls import Control, Text
+from screen.utils.internal import get_validator, isinstance
+
+
+def report(label, stmt, number):
+    best = min(timeit.repeat(stmt, number=number, repeat=5)) / number
+
+    if best >= 1e-3:
+        print(f"{label:44} {best * 1e3:8.2f} ms")
+    elif best >= 1e-6:
+        print(f"{label:44} {best * 1e6:8.2f} us")
+    else:
+        print(f"{label:44} {best * 1e9:8.2f} ns")
+
+
+def main():
+    children = [Text(content=str(i)) for i in range(10_000)]
+
+    validator = get_validator(List[Control])
+    sampled = get_validator(List[Control], sample=16)
+    scalar = get_validator(Optional[int])
+
+    print("List[Control] with 10k children")
+    report("isinstance(value, List[Control])", lambda: isinstance(children, List[Control]), 10)
+    report("compiled validator", lambda: validator(children), 50)
+    report("compiled validator, sample=16", lambda: sampled(children), 10_000)
+
+    print("Optional[int]")
+    report("isinstance(value, Optional[int])", lambda: isinstance(1, Optional[int]), 100_000)
+    report("compiled validator", lambda: scalar(1), 1_000_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,35 @@
 import collections
+import importlib
+import sys
 
-from screen import controls
-from screen import drawing
-from screen import utils
+
+# NOTE: submodules are imported on first access, so that importing
+#       screen only pays for the submodules which are used.
+_submodules = frozenset(
+    [
+        "controls",
+        "drawing",
+        "rendering",
+        "utils",
+    ]
+)
+
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f"{__name__}.{name}")
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__():
+    return sorted([*globals(), *_submodules])
 
 
 __all__ = [
     "controls",
     "drawing",
+    "rendering",
     "utils",
 ]
 
@@ -16,3 +38,12 @@ _VersionInfo = collections.namedtuple("_VersionInfo", "major minor micro release
 
 version = "0.5.0a"
 version_info = _VersionInfo(0, 5, 0, "alpha", 0)
+
+
+# NOTE: module __getattr__ requires Python 3.7, see PEP 562, so older
+#       versions import every submodule with the package.
+if sys.version_info < (3, 7):
+    from screen import controls
+    from screen import drawing
+    from screen import rendering
+    from screen import utils
@@ -1,13 +1,32 @@
-from typing import Optional
+from typing import List, Optional
 
 import abc
+import bisect
 import collections
+import collections.abc
+import contextlib
+import itertools
 import re
 import textwrap
-
-from screen.controls.primitives import HorizontalAlignment, Thickness, VerticalAlignment
+import types
+
+from screen.controls.primitives import (
+    Arrangement,
+    HorizontalAlignment,
+    Rectangle,
+    Thickness,
+    VerticalAlignment,
+)
 from screen.drawing import Color, Style
-from screen.utils.internal import get_type_doc, isinstance
+from screen.utils import len as text_len
+from screen.utils.cache import CachePolicy, LRUCache, _empty_cache, default_budget
+from screen.utils.internal import (
+    _accept,
+    builtins_isinstance,
+    get_type_doc,
+    get_validator,
+    isinstance,
+)
 
 
 _builtins_property = property
@@ -15,7 +34,9 @@ _builtins_property = property
 
 _property_attrs = ["type", "default", "optional", "invalidate_measure", "invalidate_render", "doc"]
 
-property = collections.namedtuple("property", _property_attrs, defaults=(None,))
+# NOTE: the defaults parameter of namedtuple requires Python 3.7.
+property = collections.namedtuple("property", _property_attrs)
+property.__new__.__defaults__ = (None,)
 property.__doc__ = """
 Registers a property on a :class:`~.Control`.
 
@@ -64,246 +85,1994 @@ def {name}(self):
 _property_setter = """
 
 def {name}(self, value):
-    if not optional and not isinstance(value, type):
-        raise ValueError(f"expected {{type}}, got {{value.__class__}}")
+{unwrap}{validate}{default}    if {unchanged}:
+        return
 
-    value = value if value is not None else self.__class__.default_{name}
+{adopt}{wrap}{invalidate}
+"""
 
-    if value == self._{name}:
-        return
+_property_setter_unchanged = {
+    False: "value == self._{name}",
+    True: "_unchanged(self._{name}, value)",
+}
 
-    if not invalidate_measure and not invalidate_render:
-        self._{name} = value
-        return
+_property_setter_validate = """
+    if not validate(value):
+        raise ValueError(f"expected {type}, got {value.__class__}")
+
+""".lstrip("\n")
+
+_property_setter_default = """
+    if value is None:
+        value = self.__class__.default_{name}
 
-    if (
-        callable(invalidate_measure) and invalidate_measure(self._{name}, value)
-        or invalidate_measure
-    ):
-        self._measure_cache = dict()
+""".lstrip("\n")
 
-    if (
-        callable(invalidate_render) and invalidate_render(self._name, value)
-        or invalidate_render
-    ):
-        self._render_cache = dict()
+_property_setter_unwrap = """
+    if builtins_isinstance(value, ControlList):
+        value = list(value)
+
+""".lstrip("\n")
+
+_property_setter_wrap = """
+    value = ControlList(self, name, value)
+
+""".lstrip("\n")
+
+_property_setter_adopt = """
+    _adopt(self, self._{name}, value)
+
+""".lstrip("\n")
+
+_property_setter_invalidate = """
+{prepare}    self._{name} = value
+    self._invalidate({measure}, {render})
+""".lstrip("\n")
+
+_property_setter_invalidate_callable = """
+    measure = {measure}
+    render = {render}
+
+{prepare}    self._{name} = value
+    self._invalidate(measure, render)
+""".lstrip("\n")
+
+# NOTE: the render version is incremented both before a value which
+#       invalidates the render is assigned and when the control is
+#       invalidated, so that a render which overlaps the assignment
+#       can tell, see Control.render.
+_property_setter_prepare = """
+    self._render_version += 1
+""".lstrip("\n")
+
+_property_setter_prepare_callable = """
+    if render:
+        self._render_version += 1
+""".lstrip("\n")
+
+
+def _build_setter(p, name, holds_controls, validate):
+    # NOTE: the branches of the setter are settled here, once per
+    #       property, so that an assignment only runs the statements
+    #       which apply to it.
+    measure, render = p.invalidate_measure, p.invalidate_render
+
+    if callable(measure) or callable(render):
+        template = _property_setter_invalidate_callable
+        prepare = _property_setter_prepare_callable if render else ""
+        measure = f"invalidate_measure(self._{name}, value)" if callable(measure) else bool(measure)
+        render = f"invalidate_render(self._{name}, value)" if callable(render) else bool(render)
+    else:
+        template = _property_setter_invalidate
+        prepare = _property_setter_prepare if render else ""
+        measure, render = bool(measure), bool(render)
+
+    observed = _element_type(p.type) is not None
+
+    return _property_setter.format(
+        name=name,
+        unwrap=_property_setter_unwrap if observed else "",
+        validate=_property_setter_validate if validate and not p.optional else "",
+        default=_property_setter_default.format(name=name) if p.optional else "",
+        unchanged=_property_setter_unchanged[holds_controls].format(name=name),
+        adopt=_property_setter_adopt.format(name=name) if holds_controls else "",
+        wrap=_property_setter_wrap if observed else "",
+        invalidate=template.format(name=name, measure=measure, render=render, prepare=prepare),
+    )
+
+
+# NOTE: accessors are compiled with a placeholder name, so that the
+#       accessors of every property with the same shape share a
+#       code object in which only the names are replaced. Python 3.6
+#       and 3.7 cannot replace names and compile each accessor.
+_code_placeholder = "PROPERTY"
+_code_replace = hasattr(types.CodeType, "replace")
+_code_cache = dict()
+
+
+def _compile_function(source):
+    try:
+        return _code_cache[source]
+    except (KeyError) as e:
+        pass
 
-    self._{name} = value
+    module = compile(source, "<string>", "exec")
+    code = _code_cache[source] = next(
+        c for c in module.co_consts if builtins_isinstance(c, types.CodeType)
+    )
+
+    return code
+
+
+def _compile(build, p, **kwargs):
+    if _code_replace:
+        code = _compile_function(build(_code_placeholder))
+        code = code.replace(
+            co_name=p.name,
+            co_names=tuple(n.replace(_code_placeholder, p.name) for n in code.co_names),
+        )
+    else:
+        code = _compile_function(build(p.name))
 
-"""
+    function = types.FunctionType(code, {**p._asdict(), **kwargs}, p.name)
+    function.__qualname__ = p.name
+    return function
 
 
-def _compile(source, p):
-    source = source.format(name=p.name)
-    code = compile(source, "<string>", "exec")
-    globals = {**p._asdict(), "isinstance": isinstance}
-    exec(code, globals, locals())
-    return locals()[p.name]
+_init_head = """
+def __init__(self, *, {parameters}, **kwargs):
+    cls = self.__class__
 
+    if cls is not OWNER:
+        return cls.__control_init__(self, {arguments}**kwargs)
 
-class ControlMeta(abc.ABCMeta):
-    def __new__(cls_meta, cls_name, cls_bases, cls_attrs, **kwargs):
-        properties = list()
-        slots = list(cls_attrs.get("__slots__", []))
+""".lstrip("\n")
 
-        for (attr_name, attr_value) in cls_attrs.copy().items():
-            if isinstance(attr_value, property):
-                p = _property(attr_name, *attr_value)
+_init_unwrap = """
+    if builtins_isinstance({name}, ControlList):
+        {name} = list({name})
+""".lstrip("\n")
 
-                if not p.doc:
-                    if p.type is bool:
-                        p = p._replace(
-                            doc=f"Whether the {cls_name.lower()} {p.name.replace('_', ' ')}.",
-                        )
-                    else:
-                        p = p._replace(
-                            doc=f"The {cls_name.lower()}'s {p.name.replace('_', ' ')}.",
-                        )
+_init_required = """
+    if {name} is MISSING:
+        raise TypeError("__init__ missing a required argument: '{name}'")
+""".lstrip("\n")
 
-                properties.append(p)
-                slots.append(f"_{p.name}")
+_init_validate = """
+    {keyword} not validate_{name}({name}):
+        raise ValueError(f"expected {{type_{name}}}, got {{{name}.__class__}}")
+""".lstrip("\n")
 
-                if p.optional:
-                    cls_attrs[f"default_{p.name}"] = p.default
+_init_optional = """
+    if {name} is MISSING:
+        {name} = cls.default_{name}
+""".lstrip("\n")
 
-                getter = _compile(_property_getter, p)
-                setter = _compile(_property_setter, p)
-                descriptor = _builtins_property(getter, setter)
+_init_wrap = """
+    {name} = ControlList(self, "{name}", {name})
+""".lstrip("\n")
 
-                type_doc = get_type_doc(p.type)
+_init_assign = """
+    self._{name} = {name}
+""".lstrip("\n")
 
-                if p.doc:
-                    descriptor.__doc__ = f"{p.doc}\n\n:type: {type_doc}"
-                else:
-                    descriptor.__doc__ = f":type: {type_doc}"
+_init_tail = """
+    self._arrange_cache = EMPTY_CACHE
+    self._dirty = True
+    self._key = None
+    self._measure_cache = EMPTY_CACHE
+    self._measure_version = 0
+    self._parent = None
+    self._render_cache = EMPTY_CACHE
+    self._render_version = 0
+    self._snapshot = None
+""".lstrip("\n")
 
-                cls_attrs[p.name] = descriptor
+_init_adopt = """
+    _adopt(self, None, {name})
+""".lstrip("\n")
 
-        for cls_base in cls_bases:
-            try:
-                properties.extend(cls_base.__control_properties__)
-            except (AttributeError) as e:
-                pass
 
-        properties.sort(key=lambda p: (p.optional, p.name))
+def _writable_cache(control, name, policy):
+    # NOTE: the caches of a control are only created on their first
+    #       insertion, see _EmptyCache. Two threads can both create a
+    #       cache, in which case the entries of one are only lost.
+    cache = getattr(control, name)
 
-        cls_attrs["__control_properties__"] = tuple(properties)
-        cls_attrs["__slots__"] = tuple(set(slots))
+    if cache is _empty_cache:
+        cache = policy.create()
+        setattr(control, name, cache)
 
-        parameters_doc = "Parameters\n----------\n"
+    return cache
 
-        for p in properties:
-            type_doc = get_type_doc(p.type, optional=False)
 
-            descriptor_doc = p.doc
-            if not p.optional:
-                descriptor_doc += " This parameter is not optional."
+class _WidthIntervals:
+    # NOTE: the sizes measured over intervals of widths at one height
+    #       and version, sorted by the lower bound of their interval.
+    #       Inserting copies the intervals instead of modifying them,
+    #       so lookups never see a partial insertion.
+    __slots__ = ("highs", "lows", "values")
 
-            parameters_doc += f"{p.name}: {type_doc}\n    {descriptor_doc}\n"
+    def __init__(self, lows=(), highs=(), values=()):
+        self.highs = highs
+        self.lows = lows
+        self.values = values
 
-        cls_doc = cls_attrs["__doc__"]
-        if cls_doc:
-            match = re.search(r"\n( *)\|parameters\|\n", cls_doc)
-            if match:
-                cls_doc = cls_doc.replace(
-                    " " * len(match.group(1)) + "|parameters|",
-                    textwrap.indent(parameters_doc, " " * len(match.group(1))),
-                )
-            else:
-                cls_doc += "\n\n\n" + textwrap.indent(parameters_doc, "    ")
+    def __getitem__(self, w):
+        i = bisect.bisect_right(self.lows, w) - 1
+
+        if i < 0 or (self.highs[i] is not None and w > self.highs[i]):
+            raise KeyError(w)
+
+        return self.values[i]
+
+    def insert(self, low, high, value):
+        i = bisect.bisect_left(self.lows, low)
+        j = i + (i < len(self.lows) and self.lows[i] == low)
+
+        return _WidthIntervals(
+            (*self.lows[:i], low, *self.lows[j:]),
+            (*self.highs[:i], high, *self.highs[j:]),
+            (*self.values[:i], value, *self.values[j:]),
+        )
+
+
+def _cached_measure(control, h, w, version):
+    cache = control._measure_cache
+
+    try:
+        return cache[h, w, version]
+    except (KeyError) as e:
+        if w is None:
+            raise
+
+    # NOTE: a width found in an interval is also cached on its own, so
+    #       measuring at it again is an exact hit.
+    value = cache[h, version][w]
+    cache[h, w, version] = value
+
+    return value
+
+
+def _cache_measure(control, h, w, version, value):
+    cache = _writable_cache(control, "_measure_cache", control.__class__.measure_cache_policy)
+    interval = None if w is None else control.measure_interval_core(h, w)
+
+    if interval is None:
+        cache[h, w, version] = value
+        return
+
+    try:
+        intervals = cache[h, version]
+    except (KeyError) as e:
+        intervals = _WidthIntervals()
+
+    cache[h, version] = intervals.insert(*interval, value)
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "..."
+
+
+_missing = _Missing()
+
+
+def _build_init(cls):
+    # NOTE: the generated __init__ only runs the statements which apply
+    #       to each property of the class; defaults are only looked up
+    #       for omitted properties, and only given values are validated.
+    properties = cls.__control_properties__
+    observed = cls.__control_collections__
+    validators = cls.__control_validators__
+
+    # NOTE: a subclass which customizes __init__ and calls the
+    #       __init__ of its base reaches this __init__, which hands off
+    #       to the __init__ generated for the subclass, since the
+    #       subclass can declare more properties.
+    source = [
+        _init_head.format(
+            parameters=", ".join(f"{p.name}=MISSING" for p in properties),
+            arguments="".join(f"{p.name}={p.name}, " for p in properties),
+        )
+    ]
+    globals = {
+        "OWNER": cls,
+        "_adopt": _adopt,
+        "builtins_isinstance": builtins_isinstance,
+        "ControlList": ControlList,
+        "EMPTY_CACHE": _empty_cache,
+        "MISSING": _missing,
+    }
+
+    for p in properties:
+        validate = validators[p.name] is not _accept
+
+        if p.name in observed:
+            source.append(_init_unwrap.format(name=p.name))
+
+        if p.optional:
+            source.append(_init_optional.format(name=p.name))
+
+            if validate:
+                source.append(_init_validate.format(keyword="elif", name=p.name))
         else:
-            cls_doc = parameters_doc
+            source.append(_init_required.format(name=p.name))
 
-        cls_attrs["__doc__"] = cls_doc
+            if validate:
+                source.append(_init_validate.format(keyword="if", name=p.name))
 
-        return super().__new__(cls_meta, cls_name, cls_bases, cls_attrs, **kwargs)
+        if p.name in observed:
+            source.append(_init_wrap.format(name=p.name))
 
+        source.append(_init_assign.format(name=p.name))
 
-class Control(metaclass=ControlMeta):
+        globals[f"type_{p.name}"] = p.type
+        globals[f"validate_{p.name}"] = validators[p.name]
+
+    source.append(_init_tail)
+
+    for p in properties:
+        if p.name in cls.__control_holders__:
+            source.append(_init_adopt.format(name=p.name))
+
+    function = types.FunctionType(_compile_function("\n".join(source)), globals, "__init__")
+    function.__kwdefaults__ = {p.name: _missing for p in properties}
+    function.__qualname__ = f"{cls.__qualname__}.__init__"
+    return function
+
+
+def _build_lazy_init(cls):
+    # NOTE: compiling the __init__ of each class when it is created
+    #       would cost most of the import time, so it is only compiled
+    #       when the class is first instantiated, and then replaces
+    #       this function.
+    def __init__(self, **kwargs):
+        init = _build_init(cls)
+
+        for name in ("__control_init__", "__init__"):
+            if cls.__dict__.get(name) is __init__:
+                type.__setattr__(cls, name, init)
+
+        return init(self, **kwargs)
+
+    __init__.__qualname__ = f"{cls.__qualname__}.__init__"
+    return __init__
+
+
+def _get_validator(p, validate):
+    if validate is False:
+        return _accept
+
+    return get_validator(p.type, sample=None if validate is True else validate)
+
+
+def _build_descriptor(p, validate):
+    holds_controls = _holds_controls(p.type)
+
+    getter = _compile(lambda name: _property_getter.format(name=name), p)
+    setter = _compile(
+        lambda name: _build_setter(p, name, holds_controls, validate),
+        p,
+        _adopt=_adopt,
+        _unchanged=_unchanged,
+        builtins_isinstance=builtins_isinstance,
+        ControlList=ControlList,
+        validate=_get_validator(p, validate),
+    )
+    descriptor = _builtins_property(getter, setter)
+
+    type_doc = get_type_doc(p.type)
+
+    if p.doc:
+        descriptor.__doc__ = f"{p.doc}\n\n:type: {type_doc}"
+    else:
+        descriptor.__doc__ = f":type: {type_doc}"
+
+    return descriptor
+
+
+def _holds_controls(t):
+    if builtins_isinstance(t, ControlMeta):
+        return True
+
+    return any(_holds_controls(a) for a in getattr(t, "__args__", None) or ())
+
+
+def _element_type(t):
+    # NOTE: only lists of controls are observed, see ControlList.
+    if getattr(t, "__origin__", None) in (List, list) and _holds_controls(t.__args__[0]):
+        return t.__args__[0]
+
+    return None
+
+
+def _iter_controls(value):
+    if builtins_isinstance(value, Control):
+        yield value
+    elif builtins_isinstance(value, (list, tuple, ControlList)):
+        for v in value:
+            if builtins_isinstance(v, Control):
+                yield v
+
+
+def _snapshot_value(value):
+    # NOTE: checking the metaclass avoids the slower instance check of
+    #       abstract classes for each child.
+    if builtins_isinstance(value.__class__, ControlMeta):
+        return value.snapshot()
+    elif builtins_isinstance(value, (list, tuple, ControlList)):
+        return tuple(_snapshot_value(v) for v in value)
+    else:
+        return value
+
+
+def _freeze(value):
+    if builtins_isinstance(value, Control):
+        return value._get_key()
+    elif builtins_isinstance(value, (list, tuple, ControlList)):
+        return tuple(_freeze(v) for v in value)
+    elif builtins_isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    elif builtins_isinstance(value, dict):
+        return tuple((k, _freeze(v)) for (k, v) in value.items())
+    else:
+        return value
+
+
+class _StructuralKey:
+    # NOTE: a key is only valid for the render version it was created
+    #       at, since another thread can create it from properties
+    #       which are being modified.
+    __slots__ = ("_hash", "_values", "_version")
+
+    def __init__(self, values, version):
+        self._hash = hash(values)
+        self._values = values
+        self._version = version
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        # NOTE: nested keys are shared between a control and its
+        #       ancestors, so the identity check usually ends the
+        #       comparison of two renders of the same subtree early.
+        return self is other or (self._hash == other._hash and self._values == other._values)
+
+
+class _Batch:
+    __slots__ = ("depth", "measure", "modified", "render")
+
+    def __init__(self):
+        self.depth = 0
+        self.measure = False
+        self.modified = False
+        self.render = False
+
+
+# NOTE: the enabled instrumentation, see
+#       screen.controls.instrumentation.Instrumentation.
+_instrumentation = None
+
+
+# NOTE: the frozen subclass of each control class, see
+#       Control.snapshot. Frozen classes map to themselves.
+_frozen_classes = dict()
+
+
+def _build_frozen_setter(name):
+    def setter(self, value):
+        raise AttributeError(f"cannot set '{name}' of a frozen control")
+
+    return setter
+
+
+def _frozen_update(self, **changes):
+    raise AttributeError("cannot update a frozen control")
+
+
+def _get_frozen_class(cls):
+    try:
+        return _frozen_classes[cls]
+    except (KeyError) as e:
+        pass
+
+    cls_attrs = {
+        "__control_origin__": cls,
+        "__module__": cls.__module__,
+        "__qualname__": f"Frozen{cls.__qualname__}",
+        "__slots__": (),
+        "update": _frozen_update,
+    }
+
+    for name in cls.__control_property_map__:
+        descriptor = getattr(cls, name)
+        cls_attrs[name] = _builtins_property(
+            descriptor.fget, _build_frozen_setter(name), None, descriptor.__doc__
+        )
+
+    frozen = type(cls)(f"Frozen{cls.__name__}", (cls,), cls_attrs)
+
+    _frozen_classes[cls] = _frozen_classes[frozen] = frozen
+    return frozen
+
+
+# NOTE: batches are keyed by the identity of their control, so that
+#       controls without a batch only pay for an empty dict check.
+_batches = dict()
+
+
+def _constrain(size, explicit, minimum, maximum):
+    if explicit is not None:
+        size = explicit
+
+    if maximum is not None:
+        size = min(size, maximum)
+
+    if minimum is not None:
+        size = max(size, minimum)
+
+    return size
+
+
+def _align(alignment, available, size, start, end):
+    if alignment == start:
+        return 0
+    elif alignment == end:
+        return available - size
+    else:
+        # NOTE: a stretched control which is limited by its maximum
+        #       size is centered, as in WPF.
+        return (available - size) // 2
+
+
+def _slice_columns(line, left, width):
+    if not left and text_len(line) <= width:
+        return line
+
+    parts = list()
+    column = 0
+    right = left + width
+
+    for c in line:
+        n = text_len(c)
+
+        if column >= right:
+            break
+
+        if column >= left and column + n <= right:
+            parts.append(c)
+        elif column + n > left:
+            # NOTE: a wide character straddling the edge of the
+            #       viewport is replaced by padding.
+            parts.append(" " * (min(column + n, right) - max(column, left)))
+
+        column += n
+
+    return "".join(parts)
+
+
+def _unchanged(before, after):
+    # NOTE: controls compare structurally, so a control which is equal
+    #       to the previous one but is another object is still assigned
+    #       and adopted, see _adopt.
+    if builtins_isinstance(before, Control) or builtins_isinstance(after, Control):
+        return before is after
+
+    sequences = (list, tuple, ControlList)
+
+    if builtins_isinstance(before, sequences) and builtins_isinstance(after, sequences):
+        return len(before) == len(after) and all(map(_unchanged, before, after))
+
+    return before == after
+
+
+def _adopt(parent, before, after):
+    for child in _iter_controls(before):
+        if child._parent is parent:
+            child._parent = None
+
+    for child in _iter_controls(after):
+        child._parent = parent
+
+
+class ControlList(collections.abc.MutableSequence):
     """
-    Represents the base class for a control.
+    Represents an observable list of controls.
 
-    |parameters|
+    A property declared as a list of controls, for example
+    :attr:`Stack.children <screen.controls.Stack.children>`, holds a
+    :class:`~.ControlList` created by its control. Modifying the list
+    in place validates only the new controls, and notifies the control
+    of the exact range which changed so that it can update its layout
+    incrementally. For example, appending a child to a
+    :class:`~screen.controls.Stack` only measures the new child.
+
+    Assigning a :class:`list` to the property replaces the control
+    list. A replaced control list behaves like a :class:`list` and no
+    longer notifies the control.
+
+    Controls compare structurally, so :meth:`index`, :meth:`remove`,
+    :meth:`replace`, :meth:`count`, and ``in`` find controls by
+    identity instead, and never match an equal control which is not
+    in the list.
 
     .. container:: operations
 
         .. describe:: x == y
         .. describe:: x != y
 
-            Compares two :class:`~.Control` objects.
+            Compares the controls of a :class:`~.ControlList` with
+            those of a :class:`list` or another :class:`~.ControlList`.
 
-        .. describe:: hash(x)
+        .. describe:: x[i]
+        .. describe:: x[i] = y
+        .. describe:: del x[i]
 
-            Returns the hash of the :class:`~.Control` object.
+            Gets, replaces, or removes controls. Slicing a
+            :class:`~.ControlList` returns a :class:`list`.
     """
 
-    # fmt: off
-    background           = property(Optional[Color],     None,                     True, False, True)
-    foreground           = property(Optional[Color],     None,                     True, False, True)
-    height               = property(Optional[int],       None,                     True, True,  False)
-    horizontal_alignment = property(HorizontalAlignment, HorizontalAlignment.left, True, True,  False)
-    layer                = property(int,                 0,                        True, True,  False)
-    margin               = property(Thickness,           Thickness(0),             True, True,  True)
-    max_height           = property(Optional[int],       None,                     True, True,  False)
-    max_width            = property(Optional[int],       None,                     True, True,  False)
-    min_height           = property(Optional[int],       None,                     True, True,  False)
-    min_width            = property(Optional[int],       None,                     True, True,  False)
-    padding              = property(Thickness,           Thickness(0),             True, True,  True)
-    style                = property(Optional[Style],     None,                     True, False, True)
-    vertical_alignment   = property(VerticalAlignment,   VerticalAlignment.top,    True, True,  False)
-    width                = property(Optional[int],       None,                     True, True,  False)
-    # fmt: on
+    __slots__ = ("_data", "_name", "_owner")
 
-    __slots__ = ("_measure_cache", "_render_cache")
+    def __init__(self, owner, name, controls):
+        self._data = list(controls)
+        self._name = name
+        self._owner = owner
 
-    def __init__(self, **kwargs):
-        for p in self.__class__.__control_properties__:
-            try:
-                value = kwargs.pop(p.name)
-            except (KeyError) as e:
-                if p.optional:
-                    value = getattr(self.__class__, f"default_{p.name}")
-                else:
-                    raise TypeError(f"__init__ missing a required argument: '{p.name}'") from e
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._data!r})"
 
-            if not isinstance(value, p.type):
-                raise ValueError(f"expected {p.type}, got {value.__class__}")
+    def __len__(self):
+        return len(self._data)
 
-            setattr(self, f"_{p.name}", value)
+    def __iter__(self):
+        return iter(self._data)
 
-        self._measure_cache = dict()
-        self._render_cache = dict()
+    def __reversed__(self):
+        return reversed(self._data)
 
-    def __hash__(self):
-        return hash(self.__class__.__control_properties__)
+    def __contains__(self, value):
+        return any(control is value for control in self._data)
 
     def __eq__(self, other):
-        if not isinstance(other, self.__class__):
-            return NotImplemented
+        if builtins_isinstance(other, ControlList):
+            return self._data == other._data
+        elif builtins_isinstance(other, list):
+            return self._data == other
 
-        return (
-            self.__class__.__control_properties__ == other.__class__.__control_properties__
-            and all(
-                getattr(self, name) == getattr(other, name)
-                for (name, *_) in self.__class__.__control_properties__
-            )
-        )
+        return NotImplemented
 
-    def measure(self, h, w):
+    __hash__ = None
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __setitem__(self, index, value):
+        if builtins_isinstance(index, slice):
+            start, stop, step = index.indices(len(self._data))
+
+            if step == 1:
+                self._splice(start, max(start, stop), list(value))
+            else:
+                data = self._data.copy()
+                data[index] = value
+                self._splice(0, len(self._data), data)
+        else:
+            index = self._index(index)
+            self._splice(index, index + 1, [value])
+
+    def __delitem__(self, index):
+        if builtins_isinstance(index, slice):
+            start, stop, step = index.indices(len(self._data))
+
+            if step == 1:
+                self._splice(start, max(start, stop), [])
+            else:
+                data = self._data.copy()
+                del data[index]
+                self._splice(0, len(self._data), data)
+        else:
+            index = self._index(index)
+            self._splice(index, index + 1, [])
+
+    def _index(self, index):
+        n = len(self._data)
+
+        if not -n <= index < n:
+            raise IndexError("control list index out of range")
+
+        return index % n
+
+    def _splice(self, start, stop, controls, *, validate=True):
+        owner = self._owner
+
+        # NOTE: a replaced control list is no longer observed.
+        if owner is not None and getattr(owner, f"_{self._name}") is not self:
+            owner = self._owner = None
+
+        if owner is not None and validate:
+            element, validator = owner.__class__.__control_collections__[self._name]
+
+            if validator is not _accept:
+                for control in controls:
+                    if not validator(control):
+                        raise ValueError(f"expected {element}, got {control.__class__}")
+
+        if owner is not None:
+            owner._render_version += 1
+
+        removed = self._data[start:stop]
+        self._data[start:stop] = controls
+
+        if owner is not None:
+            _adopt(owner, removed, controls)
+            owner._children_changed(self._name, start, removed, len(controls))
+
+    def insert(self, index, value):
         """
-        Calculates the desired size of the control. This method is a
-        cached implementation of :meth:`~.measure_core`.
+        Inserts a control before an index.
 
-        This method's parameters, raises, and returns are identical to
-        :meth:`~.measure_core`
+        Parameters
+        ----------
+        index: :class:`int`
+            The index.
+        value: :class:`~.Control`
+            The control.
         """
 
-        try:
-            return self._measure_cache[h, w]
-        except (KeyError) as e:
-            self._measure_cache[h, w] = value = self.measure_core(h, w, **kwargs)
-            return value
+        n = len(self._data)
+        index = min(max(index + n if index < 0 else index, 0), n)
+        self._splice(index, index, [value])
 
-    @abc.abstractmethod
-    def measure_core(self, h, w):
+    def append(self, value):
         """
-        Calculates the desired size of the control.
+        Appends a control.
 
         Parameters
         ----------
-        h: Optional[:class:`int`]
-            The available height. Can be ``None`` when the parent wants
-            to measure the child. This is a soft constraint and this
-            method may return a smaller or larger integer and hope the
-            parent can accommodate.
-        w: Optional[:class:`int`]
-            The available width. Can be ``None`` when the parent wants
-            to measure the child. This is a soft constraint and this
-            method may return a smaller or larger integer and hope the
-            parent can accommodate.
+        value: :class:`~.Control`
+            The control.
+        """
 
-        Returns
-        -------
-        Tuple[:class:`int`, :class:`int`]
-            The desired size of the control.
+        n = len(self._data)
+        self._splice(n, n, [value])
+
+    def extend(self, values):
         """
+        Appends controls. The control is only notified once.
 
-        raise NotImplementedError
+        Parameters
+        ----------
+        values: Iterable[:class:`~.Control`]
+            The controls.
+        """
 
-    def render(self, h, w):
+        n = len(self._data)
+        self._splice(n, n, list(values))
+
+    def clear(self):
+        """
+        Removes all controls.
         """
-        Renders the control. This method is a cached implementation of
-        :meth:`~.render_core`.
 
-        This method's parameters, raises, and returns are identical to
-        :meth:`~.render_core`.
+        self._splice(0, len(self._data), [])
+
+    def pop(self, index=-1):
         """
+        Removes and returns the control at an index.
 
-        try:
-            return self._render_cache[h, w]
-        except (KeyError) as e:
-            self._render_cache[h, w] = value = self.render_core(h, w, **kwargs)
-            return value
+        Parameters
+        ----------
+        index: :class:`int`
+            The index. Defaults to the last control.
+
+        Returns
+        -------
+        :class:`~.Control`
+            The control.
+        """
+
+        index = self._index(index)
+        value = self._data[index]
+        self._splice(index, index + 1, [])
+        return value
+
+    def remove(self, value):
+        """
+        Removes a control.
+
+        Parameters
+        ----------
+        value: :class:`~.Control`
+            The control to remove.
+
+        Raises
+        ------
+        ValueError
+            The control is not in the list.
+        """
+
+        index = self.index(value)
+        self._splice(index, index + 1, [])
+
+    def replace(self, value, new):
+        """
+        Replaces a control.
+
+        Parameters
+        ----------
+        value: :class:`~.Control`
+            The control to replace.
+        new: :class:`~.Control`
+            The control to replace it with.
+
+        Raises
+        ------
+        ValueError
+            The control is not in the list.
+        """
+
+        index = self.index(value)
+        self._splice(index, index + 1, [new])
+
+    def move(self, index, new_index):
+        """
+        Moves a control to another index. Only the controls between
+        both indices are affected.
+
+        Parameters
+        ----------
+        index: :class:`int`
+            The index of the control.
+        new_index: :class:`int`
+            The index to move the control to.
+        """
+
+        i = self._index(index)
+        j = self._index(new_index)
+
+        if i == j:
+            return
+
+        start, stop = min(i, j), max(i, j) + 1
+        controls = self._data[start:stop]
+
+        if i < j:
+            controls.append(controls.pop(0))
+        else:
+            controls.insert(0, controls.pop())
+
+        self._splice(start, stop, controls, validate=False)
+
+    def reverse(self):
+        """
+        Reverses the controls in place.
+        """
+
+        self._splice(0, len(self._data), self._data[::-1], validate=False)
+
+    def sort(self, *, key=None, reverse=False):
+        """
+        Sorts the controls in place.
+
+        Parameters
+        ----------
+        key: Optional[Callable[[:class:`~.Control`], Any]]
+            The function used to extract the comparison key of each
+            control.
+        reverse: :class:`bool`
+            Whether to sort in descending order.
+        """
+
+        controls = sorted(self._data, key=key, reverse=reverse)
+        self._splice(0, len(self._data), controls, validate=False)
+
+    def index(self, value, start=0, stop=None):
+        """
+        Finds the index of a control.
+
+        Parameters
+        ----------
+        value: :class:`~.Control`
+            The control.
+        start: :class:`int`
+            The index to start searching at.
+        stop: Optional[:class:`int`]
+            The index to stop searching at.
+
+        Returns
+        -------
+        :class:`int`
+            The index of the control.
+
+        Raises
+        ------
+        ValueError
+            The control is not in the list.
+        """
+
+        data = self._data
+
+        for i in range(*slice(start, stop).indices(len(data))):
+            if data[i] is value:
+                return i
+
+        raise ValueError("control is not in the list")
+
+    def count(self, value):
+        return sum(control is value for control in self._data)
+
+
+class ControlMeta(abc.ABCMeta):
+    def __new__(cls_meta, cls_name, cls_bases, cls_attrs, **kwargs):
+        properties = list()
+        slots = list(cls_attrs.get("__slots__", []))
+
+        inherited_validate = True
+        for cls_base in cls_bases:
+            inherited_validate = getattr(cls_base, "__control_validate__", inherited_validate)
+
+        validate = kwargs.pop("validate", inherited_validate)
+
+        if not builtins_isinstance(validate, bool) and validate <= 0:
+            raise ValueError(f"validate must be a bool or a positive int, got {validate}")
+
+        for (attr_name, attr_value) in cls_attrs.copy().items():
+            if builtins_isinstance(attr_value, property):
+                p = _property(attr_name, *attr_value)
+
+                if not p.doc:
+                    if p.type is bool:
+                        p = p._replace(
+                            doc=f"Whether the {cls_name.lower()} {p.name.replace('_', ' ')}.",
+                        )
+                    else:
+                        p = p._replace(
+                            doc=f"The {cls_name.lower()}'s {p.name.replace('_', ' ')}.",
+                        )
+
+                properties.append(p)
+                slots.append(f"_{p.name}")
+
+                if p.optional:
+                    cls_attrs[f"default_{p.name}"] = p.default
+
+                cls_attrs[p.name] = _build_descriptor(p, validate)
+
+        for cls_base in cls_bases:
+            try:
+                base_properties = cls_base.__control_properties__
+            except (AttributeError) as e:
+                continue
+
+            properties.extend(base_properties)
+
+            if validate != inherited_validate:
+                # NOTE: the setters of inherited properties were built
+                #       for the validation of the base class.
+                for p in base_properties:
+                    cls_attrs.setdefault(p.name, _build_descriptor(p, validate))
+
+        properties.sort(key=lambda p: (p.optional, p.name))
+
+        cls_attrs["__control_holders__"] = frozenset(
+            p.name for p in properties if _holds_controls(p.type)
+        )
+        cls_attrs["__control_properties__"] = tuple(properties)
+        cls_attrs["__control_property_map__"] = {p.name: p for p in properties}
+        cls_attrs["__control_collections__"] = {
+            p.name: (element, _get_validator(p._replace(type=element), validate))
+            for (p, element) in ((p, _element_type(p.type)) for p in properties)
+            if element is not None
+        }
+        cls_attrs["__control_validate__"] = validate
+        cls_attrs["__control_validators__"] = {
+            p.name: _get_validator(p, validate) for p in properties
+        }
+
+        # NOTE: the slot, default, validator, and kind of each property,
+        #       so that Control.update looks them up at once.
+        cls_attrs["__control_updates__"] = {
+            p.name: (
+                p,
+                f"_{p.name}",
+                f"default_{p.name}" if p.optional else None,
+                cls_attrs["__control_validators__"][p.name],
+                p.name in cls_attrs["__control_holders__"],
+                p.name in cls_attrs["__control_collections__"],
+            )
+            for p in properties
+        }
+        cls_attrs["__slots__"] = tuple(set(slots))
+
+        # NOTE: the documentation is only generated when __doc__ is
+        #       first accessed, see ControlMeta.__doc__.
+        cls_attrs["__control_doc__"] = None
+
+        cls = super().__new__(cls_meta, cls_name, cls_bases, cls_attrs, **kwargs)
+
+        if "__control_origin__" not in cls_attrs:
+            # NOTE: the class used in structural keys, which is the
+            #       class itself except for frozen classes, see
+            #       Control.snapshot.
+            cls.__control_origin__ = cls
+        cls.__control_init__ = _build_lazy_init(cls)
+
+        if "__init__" not in cls_attrs:
+            # NOTE: a class which does not customize __init__ uses its
+            #       generated __init__ directly, instead of through
+            #       Control.__init__.
+            owner = next(c for c in cls.__mro__ if "__init__" in c.__dict__)
+            init = owner.__dict__["__init__"]
+
+            if init is owner.__dict__.get("__control_init__") or init is Control.__init__:
+                cls.__init__ = cls.__control_init__
+
+        if _instrumentation is not None:
+            _instrumentation._instrument_class(cls)
+
+        return cls
+
+    @_builtins_property
+    def __doc__(cls):
+        cls_doc = cls.__dict__.get("__control_doc__")
+        if cls_doc is not None:
+            return cls_doc
+
+        parameters_doc = "Parameters\n----------\n"
+
+        for p in cls.__control_properties__:
+            type_doc = get_type_doc(p.type, optional=False)
+
+            descriptor_doc = p.doc
+            if not p.optional:
+                descriptor_doc += " This parameter is not optional."
+
+            parameters_doc += f"{p.name}: {type_doc}\n    {descriptor_doc}\n"
+
+        cls_doc = cls.__dict__.get("__doc__")
+        if cls_doc:
+            match = re.search(r"\n( *)\|parameters\|\n", cls_doc)
+            if match:
+                cls_doc = cls_doc.replace(
+                    " " * len(match.group(1)) + "|parameters|",
+                    textwrap.indent(parameters_doc, " " * len(match.group(1))),
+                )
+            else:
+                cls_doc += "\n\n\n" + textwrap.indent(parameters_doc, "    ")
+        else:
+            cls_doc = parameters_doc
+
+        type.__setattr__(cls, "__control_doc__", cls_doc)
+        return cls_doc
+
+
+class Control(metaclass=ControlMeta):
+    """
+    Represents the base class for a control.
+
+    |parameters|
+
+    .. container:: operations
+
+        .. describe:: x == y
+        .. describe:: x != y
+
+            Compares two :class:`~.Control` objects.
+
+        .. describe:: hash(x)
+
+            Returns the hash of the :class:`~.Control` object.
+
+    Property values are validated against their declared type. Inheriting
+    classes can pass ``validate`` as a class keyword argument to change
+    this: ``True`` (the default) validates every value, ``False``
+    disables validation for trusted hot paths, and a positive
+    :class:`int` validates at most that many elements of each collection.
+
+    .. code-block:: python3
+
+        class TrustedStack(Stack, validate=16):
+            pass
+
+    Cached measures and renders are keyed by a version of the control
+    which is incremented when it is invalidated, so separate subtrees
+    can be measured and rendered by several threads, and a value
+    computed from outdated properties is never returned from a cache.
+    Properties should be modified by a single thread; to render a tree
+    while it is being modified, render a :meth:`~.snapshot`.
+
+    Attributes
+    ----------
+    measure_cache_policy: :class:`~screen.utils.CachePolicy`
+        The policy used to create the measure cache of each control.
+        The cache is only created once the control is first measured.
+        Inheriting classes can override this attribute. Defaults to
+        at most 64 entries per control.
+    render_cache_policy: :class:`~screen.utils.CachePolicy`
+        The policy used to create the render cache of each control.
+        The cache is only created once the control is first rendered.
+        Inheriting classes can override this attribute. Defaults to
+        at most 16 entries per control, charged to
+        :data:`~screen.utils.default_budget`.
+    viewport_block_size: :class:`int`
+        The number of rows per block cached by :meth:`~.render_rows`.
+        Defaults to 64.
+    shared_render_cache: Optional[:class:`~screen.utils.LRUCache`]
+        The process-wide render cache keyed by the structure of a
+        control and the available size. Structurally equal controls
+        share renders through this cache, so a subtree repeated many
+        times is only rendered once. Inheriting classes whose renders
+        do not depend solely on their properties should set this
+        attribute to ``None``. Defaults to at most 4096 entries,
+        charged to :data:`~screen.utils.default_budget`.
+    """
+
+    # fmt: off
+    background           = property(Optional[Color],     None,                     True, False, True)
+    foreground           = property(Optional[Color],     None,                     True, False, True)
+    height               = property(Optional[int],       None,                     True, True,  False)
+    horizontal_alignment = property(HorizontalAlignment, HorizontalAlignment.left, True, True,  False)
+    layer                = property(int,                 0,                        True, True,  False)
+    margin               = property(Thickness,           Thickness(0),             True, True,  True)
+    max_height           = property(Optional[int],       None,                     True, True,  False)
+    max_width            = property(Optional[int],       None,                     True, True,  False)
+    min_height           = property(Optional[int],       None,                     True, True,  False)
+    min_width            = property(Optional[int],       None,                     True, True,  False)
+    padding              = property(Thickness,           Thickness(0),             True, True,  True)
+    style                = property(Optional[Style],     None,                     True, False, True)
+    vertical_alignment   = property(VerticalAlignment,   VerticalAlignment.top,    True, True,  False)
+    width                = property(Optional[int],       None,                     True, True,  False)
+    # fmt: on
+
+    measure_cache_policy = CachePolicy(64)
+    render_cache_policy = CachePolicy(16, budget=default_budget)
+    shared_render_cache = LRUCache(4096, budget=default_budget)
+    viewport_block_size = 64
+
+    __slots__ = (
+        "_arrange_cache",
+        "_dirty",
+        "_key",
+        "_measure_cache",
+        "_measure_version",
+        "_parent",
+        "_render_cache",
+        "_render_version",
+        "_snapshot",
+    )
+
+    def __init__(self, **kwargs):
+        # NOTE: the properties are initialized by the __init__ which
+        #       ControlMeta generates for each class.
+        self.__class__.__control_init__(self, **kwargs)
+
+    def __hash__(self):
+        return hash(self._get_key())
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+
+        return self._get_key() == other._get_key()
+
+    def _get_key(self):
+        key = self._key
+        version = self._render_version
+
+        if key is None or key._version != version:
+            values = [self.__class__.__control_origin__]
+
+            for p in self.__class__.__control_properties__:
+                values.append(_freeze(getattr(self, f"_{p.name}")))
+
+            self._key = key = _StructuralKey(tuple(values), version)
+
+        return key
+
+    @_builtins_property
+    def parent(self):
+        """
+        The control's parent. This is the control that most recently
+        received this control as a child, and is ``None`` for the root
+        of a control tree.
+
+        :type: Optional[:class:`~.Control`]
+        """
+
+        return self._parent
+
+    @_builtins_property
+    def is_dirty(self):
+        """
+        Whether the control has been invalidated since it was last
+        rendered. Invalidating a control also marks its ancestors as
+        dirty.
+
+        :type: :class:`bool`
+        """
+
+        return self._dirty
+
+    @_builtins_property
+    def is_frozen(self):
+        """
+        Whether the control is a :meth:`~.snapshot`, whose properties
+        cannot be modified.
+
+        :type: :class:`bool`
+        """
+
+        return self._snapshot is self
+
+    def snapshot(self):
+        """
+        Creates an immutable copy of the control and its descendants.
+
+        A snapshot can be measured and rendered on another thread while
+        the control keeps being modified. Snapshots are kept until the
+        control is invalidated, so the snapshots of unmodified subtrees
+        are shared: after a single property is modified, taking a new
+        snapshot only copies the modified control and its ancestors.
+
+        Snapshots should be taken on the thread which modifies the
+        control. Snapshots have their own caches and no
+        :attr:`~.parent`, since a
+        snapshot can be shared by the snapshots of several ancestors.
+        Modifying a property of a snapshot raises
+        :exc:`AttributeError`, and the snapshot of a snapshot is itself.
+        The lists of controls of a snapshot, such as
+        :attr:`Stack.children <screen.controls.Stack.children>`, are
+        tuples instead of :class:`~.ControlList` objects.
+
+        Returns
+        -------
+        :class:`~.Control`
+            The snapshot, which is an instance of a frozen subclass of
+            the control's class.
+        """
+
+        snapshot = self._snapshot
+
+        if snapshot is None:
+            snapshot = self._snapshot = self._create_snapshot()
+
+        return snapshot
+
+    def _create_snapshot(self):
+        # NOTE: inheriting classes with their own layout state reset it
+        #       on the snapshot, which must not share mutable state with
+        #       the control.
+        cls = _get_frozen_class(self.__class__)
+        holders = cls.__control_holders__
+
+        snapshot = cls.__new__(cls)
+
+        for p in cls.__control_properties__:
+            value = getattr(self, f"_{p.name}")
+
+            if p.name in holders:
+                value = _snapshot_value(value)
+
+            setattr(snapshot, f"_{p.name}", value)
+
+        snapshot._arrange_cache = _empty_cache
+        snapshot._dirty = True
+        snapshot._key = self._key
+        snapshot._measure_cache = _empty_cache
+        snapshot._measure_version = self._measure_version
+        snapshot._parent = None
+        snapshot._render_cache = _empty_cache
+        snapshot._render_version = self._render_version
+        snapshot._snapshot = snapshot
+
+        return snapshot
+
+    def update(self, **changes):
+        """
+        Modifies several properties at once.
+
+        Every value is validated before any is applied, and the
+        ancestors of the control are invalidated once, rather than once
+        per modified property.
+
+        Parameters
+        ----------
+        **changes
+            The properties to modify and their values. ``None`` resets
+            an optional property to its default, as with assignment.
+
+        Raises
+        ------
+        TypeError
+            A keyword argument is not a property of the control.
+        ValueError
+            A value is not of the property's type.
+        """
+
+        updates = self.__class__.__control_updates__
+
+        if len(changes) == 1 or self._parent is None:
+            # NOTE: a single property, or a control without ancestors,
+            #       is invalidated as cheaply by the setters. Only the
+            #       setters of required properties validate, so the
+            #       required values are validated here, except the one
+            #       applied first, which its setter validates.
+            first = None
+
+            for (name, value) in changes.items():
+                try:
+                    (p, _, _, validate, _, observes) = updates[name]
+                except (KeyError) as e:
+                    raise TypeError(f"update got an unexpected keyword argument '{name}'") from None
+
+                if p.optional:
+                    continue
+
+                if first is None:
+                    first = name
+                    continue
+
+                if observes and builtins_isinstance(value, ControlList):
+                    value = list(value)
+
+                if not validate(value):
+                    raise ValueError(f"expected {p.type}, got {value.__class__}")
+
+            if first is not None:
+                setattr(self, first, changes.pop(first))
+
+            for (name, value) in changes.items():
+                setattr(self, name, value)
+
+            return
+
+        measure = render = False
+        modified = list()
+
+        for (name, value) in changes.items():
+            try:
+                (p, slot, default, validate, holds, observes) = updates[name]
+            except (KeyError) as e:
+                raise TypeError(f"update got an unexpected keyword argument '{name}'") from None
+
+            if observes and builtins_isinstance(value, ControlList):
+                value = list(value)
+
+            if default is not None:
+                if value is None:
+                    value = getattr(self, default)
+            elif not validate(value):
+                raise ValueError(f"expected {p.type}, got {value.__class__}")
+
+            before = getattr(self, slot)
+
+            if holds:
+                unchanged = _unchanged(before, value)
+            else:
+                unchanged = value == before
+
+            if unchanged:
+                continue
+
+            m, r = p.invalidate_measure, p.invalidate_render
+
+            measure = measure or (m(before, value) if callable(m) else m)
+            render = render or (r(before, value) if callable(r) else r)
+
+            modified.append((slot, holds, observes, name, before, value))
+
+        if not modified:
+            return
+
+        if render:
+            self._render_version += 1
+
+        for (slot, holds, observes, name, before, value) in modified:
+            if holds:
+                _adopt(self, before, value)
+
+            if observes:
+                value = ControlList(self, name, value)
+
+            setattr(self, slot, value)
+
+        self._invalidate(bool(measure), bool(render))
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Defers the invalidation of the control until the end of a
+        ``with`` block.
+
+        Properties modified inside the block are validated and applied
+        immediately, but the control and its ancestors are invalidated
+        at most once, when the outermost block exits. Controls inside a
+        batched control also stop invalidating their ancestors at the
+        batched control, so a single batch on the root of a tree
+        coalesces the modifications of the whole tree.
+
+        .. code-block:: python3
+
+            with control.batch():
+                control.foreground = theme.foreground
+                control.background = theme.background
+        """
+
+        key = id(self)
+
+        try:
+            batch = _batches[key]
+        except (KeyError) as e:
+            batch = _batches[key] = _Batch()
+
+        batch.depth += 1
+
+        try:
+            yield self
+        finally:
+            batch.depth -= 1
+
+            if not batch.depth:
+                del _batches[key]
+
+                # NOTE: overrides of _invalidate have already run for
+                #       each modification.
+                if batch.modified:
+                    Control._invalidate(self, batch.measure, batch.render)
+
+    def _invalidate(self, measure, render):
+        self._key = None
+
+        # NOTE: a control only has a snapshot if its descendants have
+        #       one, so the walk stops at the first control without.
+        control = self
+        while control is not None and control._snapshot is not None:
+            control._snapshot = None
+            control = control._parent
+
+        if _batches:
+            batch = _batches.get(id(self))
+
+            if batch is not None:
+                batch.measure = batch.measure or bool(measure)
+                batch.modified = True
+                batch.render = batch.render or bool(render)
+                return
+
+        if not measure and not render:
+            control = self._parent
+            while control is not None and control._key is not None:
+                control._key = None
+                control = control._parent
+
+            return
+
+        # NOTE: cache keys include the versions, so a value computed
+        #       from the previous properties by another thread is never
+        #       read, even if it is inserted after the caches are
+        #       cleared. Versions are incremented before clearing.
+        if measure:
+            self._measure_version += 1
+            self._arrange_cache.clear()
+            self._measure_cache.clear()
+
+        if render:
+            self._render_version += 1
+            self._render_cache.clear()
+
+        self._dirty = True
+
+        child = self
+        control = self._parent
+        while control is not None:
+            control._key = None
+
+            # NOTE: a parent lays its children out using their measures,
+            #       so invalidating the measure of a child invalidates
+            #       both caches of its ancestors.
+            if measure:
+                control._measure_version += 1
+                control._arrange_cache.clear()
+                control._measure_cache.clear()
+                control._child_measure_invalidated(child)
+
+            control._render_version += 1
+            control._render_cache.clear()
+            control._dirty = True
+
+            if _batches:
+                batch = _batches.get(id(control))
+
+                # NOTE: the batched ancestor invalidates its own
+                #       ancestors once its batch exits.
+                if batch is not None:
+                    batch.measure = batch.measure or bool(measure)
+                    batch.modified = True
+                    batch.render = True
+                    return
+
+            child = control
+            control = control._parent
+
+    def _child_measure_invalidated(self, child):
+        pass
+
+    def _children_changed(self, name, index, removed, inserted):
+        # NOTE: inheriting classes can update their layout state for
+        #       the changed range before invalidating.
+        self._invalidate(True, True)
+
+    def measure(self, h, w):
+        """
+        Calculates the desired size of the control. This method is a
+        cached implementation of :meth:`~.measure_core`. The cache is
+        created from :attr:`~.measure_cache_policy`, and answers every
+        width of the interval reported by
+        :meth:`~.measure_interval_core`.
+
+        This method's parameters, raises, and returns are identical to
+        :meth:`~.measure_core`
+        """
+
+        version = self._measure_version
+
+        try:
+            return _cached_measure(self, h, w, version)
+        except (KeyError) as e:
+            value = self.measure_core(h, w)
+
+            _cache_measure(self, h, w, version, value)
+            return value
+
+    @abc.abstractmethod
+    def measure_core(self, h, w):
+        """
+        Calculates the desired size of the control.
+
+        Parameters
+        ----------
+        h: Optional[:class:`int`]
+            The available height. Can be ``None`` when the parent wants
+            to measure the child. This is a soft constraint and this
+            method may return a smaller or larger integer and hope the
+            parent can accommodate.
+        w: Optional[:class:`int`]
+            The available width. Can be ``None`` when the parent wants
+            to measure the child. This is a soft constraint and this
+            method may return a smaller or larger integer and hope the
+            parent can accommodate.
+
+        Returns
+        -------
+        Tuple[:class:`int`, :class:`int`]
+            The desired size of the control.
+        """
+
+        raise NotImplementedError
+
+    def measure_interval_core(self, h, w):
+        """
+        Calculates the interval of available widths over which
+        :meth:`~.measure_core` returns the same size as for ``w``.
+        This method is called by :meth:`~.measure` after a cache miss,
+        so that a resize within the interval does not measure the
+        control again.
+
+        The default implementation returns ``None``. Inheriting classes
+        whose size only changes at some widths, for example wrapped
+        text, can override this method.
+
+        Parameters
+        ----------
+        h: Optional[:class:`int`]
+            The available height.
+        w: :class:`int`
+            The available width.
+
+        Returns
+        -------
+        Optional[Tuple[:class:`int`, Optional[:class:`int`]]]
+            The lowest and highest widths of the interval, which
+            contains ``w``. The highest width is ``None`` when the
+            interval is unbounded. ``None`` means only ``w`` is known
+            to be part of the interval.
+        """
+
+        return None
+
+    def fit_width(self, h):
+        """
+        Calculates the narrowest available width at which the control
+        fits in a number of rows, for example to size a column to its
+        content.
+
+        The width is found by a binary search between the bounds
+        calculated by :meth:`~.width_bounds_core`, measuring the
+        control with :meth:`~.measure`, so the measure cache answers the
+        widths which were already measured. The height of the control
+        should not increase with the available width.
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The number of rows, which is also the available height.
+
+        Returns
+        -------
+        Optional[:class:`int`]
+            The width, or ``None`` when the control does not fit in
+            ``h`` rows at any width.
+        """
+
+        (low, high) = self.width_bounds_core(h)
+
+        if self.measure(h, high)[0] > h:
+            return None
+
+        while low < high:
+            middle = (low + high) // 2
+
+            if self.measure(h, middle)[0] <= h:
+                high = middle
+            else:
+                low = middle + 1
+
+        return low
+
+    def width_bounds_core(self, h):
+        """
+        Calculates the interval of available widths searched by
+        :meth:`~.fit_width`.
+
+        The default implementation returns zero and the desired width
+        of the control when the available width is unbounded. Inheriting
+        classes which can calculate tighter bounds, for example the
+        width of the longest word of a text, can override this method.
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The available height.
+
+        Returns
+        -------
+        Tuple[:class:`int`, :class:`int`]
+            The lowest width to search, below which the control is not
+            worth fitting, for example because its content would be
+            broken, and the highest width to search, above which the
+            size of the control does not change.
+        """
+
+        return (0, self.measure(h, None)[1])
+
+    def layout_size(self, h, w):
+        """
+        Calculates the size the control occupies in a layout slot.
+
+        This method takes into account the control's :attr:`~.margin`,
+        :attr:`~.padding`, :attr:`~.height`, :attr:`~.width`, and
+        minimum and maximum sizes. The size of the content is calculated
+        by :meth:`~.measure`.
+
+        Parameters
+        ----------
+        h: Optional[:class:`int`]
+            The height of the slot. Can be ``None`` when the slot is
+            unbounded vertically.
+        w: Optional[:class:`int`]
+            The width of the slot. Can be ``None`` when the slot is
+            unbounded horizontally.
+
+        Returns
+        -------
+        Tuple[:class:`int`, :class:`int`]
+            The size of the control, including its margin.
+        """
+
+        m = self._margin
+        p = self._padding
+
+        mh = m.top + m.bottom
+        mw = m.left + m.right
+        ph = p.top + p.bottom
+        pw = p.left + p.right
+
+        if h is not None:
+            h = _constrain(h - mh, self._height, None, self._max_height)
+            h = max(h - ph, 0)
+        elif self._height is not None:
+            h = max(self._height - ph, 0)
+
+        if w is not None:
+            w = _constrain(w - mw, self._width, None, self._max_width)
+            w = max(w - pw, 0)
+        elif self._width is not None:
+            w = max(self._width - pw, 0)
+
+        dh, dw = self.measure(h, w)
+
+        dh = _constrain(dh + ph, self._height, self._min_height, self._max_height)
+        dw = _constrain(dw + pw, self._width, self._min_width, self._max_width)
+
+        return (dh + mh, dw + mw)
+
+    def arrange(self, h, w):
+        """
+        Arranges the control and its descendants in a layout slot.
+
+        The control is sized by :meth:`~.layout_size` and placed in the
+        slot according to its :attr:`~.margin`,
+        :attr:`~.horizontal_alignment`, and :attr:`~.vertical_alignment`.
+        Its children are then arranged inside its :attr:`~.padding` by
+        :meth:`~.arrange_core`.
+
+        Arrangements are cached by slot size and invalidated along with
+        measures, so arranging an unchanged tree again does no layout
+        work.
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The height of the slot.
+        w: :class:`int`
+            The width of the slot.
+
+        Returns
+        -------
+        :class:`~screen.controls.primitives.Arrangement`
+            The arrangement.
+        """
+
+        version = self._measure_version
+
+        try:
+            return self._arrange_cache[h, w, version]
+        except (KeyError) as e:
+            pass
+
+        m = self._margin
+        p = self._padding
+
+        available_h = max(h - m.top - m.bottom, 0)
+        available_w = max(w - m.left - m.right, 0)
+
+        dh, dw = self.layout_size(h, w)
+        dh -= m.top + m.bottom
+        dw -= m.left + m.right
+
+        if self._vertical_alignment == VerticalAlignment.stretch and self._height is None:
+            dh = _constrain(available_h, None, self._min_height, self._max_height)
+
+        if self._horizontal_alignment == HorizontalAlignment.stretch and self._width is None:
+            dw = _constrain(available_w, None, self._min_width, self._max_width)
+
+        dh = min(dh, available_h)
+        dw = min(dw, available_w)
+
+        top = m.top + _align(
+            self._vertical_alignment,
+            available_h,
+            dh,
+            VerticalAlignment.top,
+            VerticalAlignment.bottom,
+        )
+        left = m.left + _align(
+            self._horizontal_alignment,
+            available_w,
+            dw,
+            HorizontalAlignment.left,
+            HorizontalAlignment.right,
+        )
+
+        ch = max(dh - p.top - p.bottom, 0)
+        cw = max(dw - p.left - p.right, 0)
+
+        children = [(p.top + t, p.left + l, a) for (t, l, a) in self.arrange_core(ch, cw)]
+        children.sort(key=lambda c: c[2].control._layer)
+
+        arrangement = Arrangement(self, Rectangle(top, left, dh, dw), tuple(children))
+        cache = _writable_cache(self, "_arrange_cache", self.__class__.measure_cache_policy)
+        cache[h, w, version] = arrangement
+
+        return arrangement
+
+    def arrange_core(self, h, w):
+        """
+        Arranges the children of the control.
+
+        The default implementation arranges no children. Inheriting
+        classes which hold children should override this method and
+        call :meth:`~.arrange` on each child.
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The height of the content area of the control.
+        w: :class:`int`
+            The width of the content area of the control.
+
+        Returns
+        -------
+        Iterable[Tuple[:class:`int`, :class:`int`, :class:`~.Arrangement`]]
+            The top, left, and arrangement of each child slot, relative
+            to the content area.
+        """
+
+        return ()
+
+    def render(self, h, w):
+        """
+        Renders the control. This method is a cached implementation of
+        :meth:`~.render_core`. The cache is created from
+        :attr:`~.render_cache_policy` and backed by
+        :attr:`~.shared_render_cache`.
+
+        This method's parameters, raises, and returns are identical to
+        :meth:`~.render_core`.
+        """
+
+        version = self._render_version
+
+        try:
+            value = self._render_cache[h, w, version]
+        except (KeyError) as e:
+            shared = self.__class__.shared_render_cache
+
+            if shared is None:
+                value = tuple(self.render_core(h, w))
+            else:
+                key = (self._get_key(), h, w)
+
+                try:
+                    value = shared[key]
+                except (KeyError) as e:
+                    value = tuple(self.render_core(h, w))
+
+                    # NOTE: a render which overlapped the modification
+                    #       of a property may not match its key.
+                    if self._render_version == version:
+                        shared[key] = value
+                else:
+                    if _instrumentation is not None:
+                        _instrumentation._count_shared_hit(self)
+
+            cache = _writable_cache(self, "_render_cache", self.__class__.render_cache_policy)
+            cache[h, w, version] = value
+
+        self._dirty = False
+
+        return iter(value)
+
+    def render_rows(self, h, w, start, stop):
+        """
+        Renders a range of rows of the control. This method is a cached
+        implementation of :meth:`~.render_rows_core`. Rows are cached in
+        blocks of :attr:`~.viewport_block_size` rows, so rendering a
+        range only renders the blocks it overlaps.
+
+        This method's parameters, raises, and returns are identical to
+        :meth:`~.render_rows_core`.
+        """
+
+        start = max(start, 0)
+        stop = min(stop, h)
+
+        if start >= stop:
+            return iter(())
+
+        size = self.__class__.viewport_block_size
+        version = self._render_version
+        blocks = list()
+
+        for block in range(start // size, (stop - 1) // size + 1):
+            try:
+                rows = self._render_cache[h, w, block, version]
+            except (KeyError) as e:
+                rows = tuple(
+                    self.render_rows_core(h, w, block * size, min((block + 1) * size, h))
+                )
+
+                cache = _writable_cache(self, "_render_cache", self.__class__.render_cache_policy)
+                cache[h, w, block, version] = rows
+
+            offset = block * size
+            blocks.append(rows[max(start - offset, 0) : stop - offset])
+
+        self._dirty = False
+
+        return itertools.chain.from_iterable(blocks)
+
+    def render_rows_core(self, h, w, start, stop):
+        """
+        Renders a range of rows of the control.
+
+        The default implementation slices the result of
+        :meth:`~.render`. Inheriting classes with very tall content
+        should override this method to only produce the requested rows.
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The available height. This is a hard constraint.
+        w: :class:`int`
+            The available width. This is a hard constraint.
+        start: :class:`int`
+            The first row to render.
+        stop: :class:`int`
+            The row to stop rendering at, exclusive.
+
+        Returns
+        -------
+        Iterator[:class:`str`]
+            An iterator yielding the lines in ``[start, stop)``.
+        """
+
+        return itertools.islice(self.render(h, w), start, stop)
+
+    def render_viewport(self, h, w, top, left, height, width):
+        """
+        Renders a rectangle of the control, without rendering the rows
+        outside of it.
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The available height. This is a hard constraint.
+        w: :class:`int`
+            The available width. This is a hard constraint.
+        top: :class:`int`
+            The vertical offset of the viewport.
+        left: :class:`int`
+            The horizontal offset of the viewport.
+        height: :class:`int`
+            The height of the viewport.
+        width: :class:`int`
+            The width of the viewport.
+
+        Returns
+        -------
+        Iterator[:class:`str`]
+            An iterator yielding the visible part of each visible line.
+        """
+
+        rows = self.render_rows(h, w, top, top + height)
+
+        if not left and width >= w:
+            return rows
+
+        return (_slice_columns(line, left, width) for line in rows)
+
+    def render_into(self, view):
+        """
+        Renders the control into a rectangle of a buffer, applying the
+        control's :attr:`~.background`, :attr:`~.foreground`, and
+        :attr:`~.style`.
+
+        The default implementation writes the lines returned by
+        :meth:`~.render` into the view. Inheriting classes can override
+        this method to draw directly into the buffer.
+
+        Parameters
+        ----------
+        view: :class:`~screen.rendering.BufferView`
+            The rectangle to render into. Its height and width are the
+            available height and width.
+        """
+
+        foreground = self._foreground
+        background = self._background
+        style = self._style
+
+        if background is not None:
+            view.fill(background=background)
+
+        for (row, line) in enumerate(self.render(view.height, view.width)):
+            view.write(row, 0, line, foreground=foreground, background=background, style=style)
 
     @abc.abstractmethod
     def render_core(self, h, w):
@@ -333,6 +2102,8 @@ class Control(metaclass=ControlMeta):
 from screen.controls import primitives
 from screen.controls.border import *
 from screen.controls.border import __all__ as _border__all__
+from screen.controls.instrumentation import *
+from screen.controls.instrumentation import __all__ as _instrumentation__all__
 from screen.controls.stack import *
 from screen.controls.stack import __all__ as _stack__all__
 from screen.controls.text import *
@@ -342,7 +2113,9 @@ from screen.controls.text import __all__ as _text__all__
 __all__ = [
     "property",
     "Control",
+    "ControlList",
     *_border__all__,
+    *_instrumentation__all__,
     *_stack__all__,
     *_text__all__,
 ]
@@ -1,7 +1,25 @@
-from typing import Any, Callable, ClassVar, Iterator, NamedTuple, Optional, Type, Union
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    ContextManager,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    NamedTuple,
+    Optional,
+    Type,
+    Union,
+    overload,
+)
 
-from screen.controls.primitives import HorizontalAlignment, Thickness, VerticalAlignment
+import builtins
+
+from screen.controls.primitives import Arrangement, HorizontalAlignment, Thickness, VerticalAlignment
 from screen.drawing import Color, Style
+from screen.rendering import BufferView
+from screen.utils import CachePolicy, LRUCache
 
 
 class property(NamedTuple):
@@ -29,6 +47,11 @@ class Control:
     default_vertical_alignment: ClassVar[VerticalAlignment]
     default_width: ClassVar[Optional[int]]
 
+    measure_cache_policy: ClassVar[CachePolicy]
+    render_cache_policy: ClassVar[CachePolicy]
+    shared_render_cache: ClassVar[Optional[LRUCache]]
+    viewport_block_size: ClassVar[int]
+
     def __init__(
         self,
         *,
@@ -105,12 +128,63 @@ class Control:
     @width.setter
     def width(self, value: Optional[int]) -> None: ...
 
+    @builtins.property
+    def parent(self) -> Optional[Control]: ...
+    @builtins.property
+    def is_dirty(self) -> bool: ...
+    @builtins.property
+    def is_frozen(self) -> bool: ...
+    def snapshot(self) -> Control: ...
+
+    def update(self, **changes: Any) -> None: ...
+    def batch(self) -> ContextManager[Control]: ...
+
     def measure(self, h: int, w: int) -> tuple[int, int]: ...
     def measure_core(self, h: int, w: int) -> tuple[int, int]: ...
+    def measure_interval_core(self, h: Optional[int], w: int) -> Optional[tuple[int, Optional[int]]]: ...
+    def fit_width(self, h: int) -> Optional[int]: ...
+    def width_bounds_core(self, h: int) -> tuple[int, int]: ...
+    def layout_size(self, h: Optional[int], w: Optional[int]) -> tuple[int, int]: ...
+    def arrange(self, h: int, w: int) -> Arrangement: ...
+    def arrange_core(self, h: int, w: int) -> Iterable[tuple[int, int, Arrangement]]: ...
     def render(self, h: int, w: int) -> Iterator[str]: ...
+    def render_rows(self, h: int, w: int, start: int, stop: int) -> Iterator[str]: ...
+    def render_rows_core(self, h: int, w: int, start: int, stop: int) -> Iterator[str]: ...
+    def render_viewport(self, h: int, w: int, top: int, left: int, height: int, width: int) -> Iterator[str]: ...
+    def render_into(self, view: BufferView) -> None: ...
     def render_core(self, h: int, w: int) -> Iterator[str]: ...
 
 
+class ControlList(MutableSequence[Control]):
+    def __init__(self, owner: Control, name: str, controls: Iterable[Control]) -> None: ...
+
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator[Control]: ...
+    @overload
+    def __getitem__(self, index: int) -> Control: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[Control]: ...
+    @overload
+    def __setitem__(self, index: int, value: Control) -> None: ...
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[Control]) -> None: ...
+    def __delitem__(self, index: Union[int, slice]) -> None: ...
+
+    def insert(self, index: int, value: Control) -> None: ...
+    def append(self, value: Control) -> None: ...
+    def extend(self, values: Iterable[Control]) -> None: ...
+    def clear(self) -> None: ...
+    def pop(self, index: int=...) -> Control: ...
+    def remove(self, value: Control) -> None: ...
+    def replace(self, value: Control, new: Control) -> None: ...
+    def move(self, index: int, new_index: int) -> None: ...
+    def reverse(self) -> None: ...
+    def sort(self, *, key: Optional[Callable[[Control], Any]]=..., reverse: bool=...) -> None: ...
+    def index(self, value: Control, start: int=..., stop: Optional[int]=...) -> int: ...
+    def count(self, value: Control) -> int: ...
+
+
 from screen.controls.border import Border as Border
+from screen.controls.instrumentation import Instrumentation as Instrumentation
 from screen.controls.stack import Stack as Stack
 from screen.controls.text import Text as Text
@@ -31,7 +31,45 @@ class Border(Control):
     # fmt: on
 
     def measure_core(self, h, w):
-        raise NotImplementedError
+        t = self._thickness
+
+        th = t.top + t.bottom
+        tw = t.left + t.right
+
+        h = None if h is None else max(h - th, 0)
+        w = None if w is None else max(w - tw, 0)
+
+        dh, dw = self._child.layout_size(h, w)
+        return (dh + th, dw + tw)
+
+    def width_bounds_core(self, h):
+        t = self._thickness
+        child = self._child
+
+        m = child._margin
+        p = child._padding
+
+        # NOTE: the child is measured within the thickness of the border
+        #       and its own margin and padding, see layout_size.
+        th = t.top + t.bottom + m.top + m.bottom + p.top + p.bottom
+        tw = t.left + t.right + m.left + m.right + p.left + p.right
+
+        (low, _) = child.width_bounds_core(max(h - th, 0))
+        (_, high) = super().width_bounds_core(h)
+
+        return (min(low + tw, high), high)
+
+    def arrange_core(self, h, w):
+        t = self._thickness
+
+        yield (
+            t.top,
+            t.left,
+            self._child.arrange(max(h - t.top - t.bottom, 0), max(w - t.left - t.right, 0)),
+        )
+
+        if self._header is not None and t.top:
+            yield (0, t.left, self._header.arrange(t.top, max(w - t.left - t.right, 0)))
 
     def render_core(self, h, w):
         raise NotImplementedError
@@ -0,0 +1,501 @@
+import collections
+import threading
+import time
+
+from screen import controls
+from screen.controls import Control
+from screen.utils.cache import LRUCache
+
+
+class _ClassCounters:
+    __slots__ = (
+        "invalidations",
+        "measure_evictions",
+        "measure_hits",
+        "measure_misses",
+        "measure_time",
+        "render_evictions",
+        "render_hits",
+        "render_misses",
+        "render_shared_hits",
+        "render_time",
+    )
+
+    def __init__(self):
+        self.invalidations = collections.Counter()
+        self.measure_evictions = 0
+        self.measure_hits = 0
+        self.measure_misses = 0
+        self.measure_time = 0.0
+        self.render_evictions = 0
+        self.render_hits = 0
+        self.render_misses = 0
+        self.render_shared_hits = 0
+        self.render_time = 0.0
+
+    def snapshot(self):
+        return {
+            "measure": {
+                "hits": self.measure_hits,
+                "misses": self.measure_misses,
+                "evictions": self.measure_evictions,
+                "time": self.measure_time,
+            },
+            "render": {
+                "hits": self.render_hits,
+                "shared_hits": self.render_shared_hits,
+                "misses": self.render_misses,
+                "evictions": self.render_evictions,
+                "time": self.render_time,
+            },
+            "invalidations": dict(self.invalidations),
+        }
+
+
+def _class_name(cls):
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _invalidates(p, before, after):
+    m, r = p.invalidate_measure, p.invalidate_render
+
+    measure = m(before, after) if callable(m) else m
+    render = r(before, after) if callable(r) else r
+
+    return bool(measure or render)
+
+
+class Instrumentation:
+    """
+    Represents opt-in counters of the caches and invalidations of
+    controls.
+
+    While enabled, the instrumentation counts, for each control class,
+    the hits, misses, and evictions of the measure and render caches,
+    the time spent in :meth:`~screen.controls.Control.measure_core` and
+    :meth:`~screen.controls.Control.render_core`, and the invalidations
+    caused by each property, whether modified through its setter or
+    :meth:`~screen.controls.Control.update`.
+
+    Enabling the instrumentation wraps the cached methods, the core
+    methods, and the property setters of every control class with
+    counting versions, and disabling it restores them, so controls are
+    not slowed down while no instrumentation is enabled. Only one
+    instrumentation can be enabled at a time.
+
+    .. note::
+
+        Times are inclusive: the time spent rendering a control
+        includes the time spent rendering its children. Evictions are
+        attributed to the class whose insertion caused them, which
+        includes evictions from other caches sharing a
+        :class:`~screen.utils.CacheBudget`.
+
+    .. container:: operations
+
+        .. describe:: with x:
+
+            Enables the instrumentation for the duration of the block.
+
+    Parameters
+    ----------
+    callback: Optional[Callable[[Dict[:class:`str`, Any]], Any]]
+        The function periodically called with a :meth:`~.snapshot`.
+        The callback is called from :meth:`~.poll`, which is called
+        after each render while the instrumentation is enabled.
+    interval: :class:`float`
+        The minimum interval between two calls of ``callback``, in
+        seconds.
+    clock: Callable[[], :class:`float`]
+        The monotonic clock used to measure times. Defaults to
+        :func:`time.perf_counter`.
+
+
+    Attributes
+    ----------
+    callback: Optional[Callable[[Dict[:class:`str`, Any]], Any]]
+        The function periodically called with a :meth:`~.snapshot`.
+    interval: :class:`float`
+        The minimum interval between two calls of ``callback``, in
+        seconds.
+    """
+
+    __slots__ = (
+        "_clock",
+        "_counters",
+        "_deadline",
+        "_local",
+        "_originals",
+        "callback",
+        "interval",
+    )
+
+    def __init__(self, *, callback=None, interval=1.0, clock=time.perf_counter):
+        self._clock = clock
+        self._counters = dict()
+        self._deadline = None
+        self._local = threading.local()
+        self._originals = None
+
+        self.callback = callback
+        self.interval = interval
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} enabled={self.enabled} classes={len(self._counters)}>"
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    @property
+    def enabled(self):
+        """
+        Whether the instrumentation is enabled.
+
+        :type: :class:`bool`
+        """
+
+        return self._originals is not None
+
+    def enable(self):
+        """
+        Enables the instrumentation.
+
+        Raises
+        ------
+        RuntimeError
+            Another instrumentation is enabled.
+        """
+
+        if self.enabled:
+            return
+
+        if controls._instrumentation is not None:
+            raise RuntimeError("another instrumentation is enabled")
+
+        self._originals = list()
+        self._deadline = self._clock() + self.interval
+
+        self._patch(LRUCache, "_evict", self._build_evict(LRUCache._evict))
+        self._patch(Control, "measure", self._build_measure(Control.measure))
+        self._patch(Control, "render", self._build_render(Control.render))
+        self._patch(Control, "update", self._build_update(Control.update))
+
+        classes = [Control]
+        while classes:
+            cls = classes.pop()
+            classes.extend(cls.__subclasses__())
+
+            self._instrument_class(cls)
+
+        controls._instrumentation = self
+
+    def disable(self):
+        """
+        Disables the instrumentation. The counters are kept until
+        :meth:`~.reset` is called.
+        """
+
+        if not self.enabled:
+            return
+
+        for (cls, name, value) in reversed(self._originals):
+            type.__setattr__(cls, name, value)
+
+        self._originals = None
+
+        controls._instrumentation = None
+
+    def reset(self):
+        """
+        Resets the counters.
+        """
+
+        self._counters.clear()
+
+    def snapshot(self, *, reset=False):
+        """
+        Exports the counters.
+
+        Parameters
+        ----------
+        reset: :class:`bool`
+            Whether to reset the counters afterwards.
+
+        Returns
+        -------
+        Dict[:class:`str`, Any]
+            The counters of each control class, keyed by the qualified
+            name of the class.
+
+        Examples
+        --------
+
+        .. code-block:: python3
+
+            >>> instrumentation.snapshot()
+            {
+                "screen.controls.Text": {
+                    "measure": {
+                        "hits": 12, "misses": 2, "evictions": 0, "time": 0.0004,
+                    },
+                    "render": {
+                        "hits": 3, "shared_hits": 1, "misses": 2, "evictions": 0, "time": 0.0011,
+                    },
+                    "invalidations": {"content": 2},
+                },
+            }
+        """
+
+        snapshot = {_class_name(cls): c.snapshot() for (cls, c) in self._counters.items()}
+
+        if reset:
+            self.reset()
+
+        return snapshot
+
+    def poll(self):
+        """
+        Calls ``callback`` with a :meth:`~.snapshot` if ``interval``
+        has elapsed since it was last called.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether ``callback`` was called.
+        """
+
+        if self.callback is None or self._clock() < self._deadline:
+            return False
+
+        self._deadline = self._clock() + self.interval
+        self.callback(self.snapshot())
+
+        return True
+
+    def _get_counters(self, cls):
+        try:
+            return self._counters[cls]
+        except (KeyError) as e:
+            counters = self._counters[cls] = _ClassCounters()
+            return counters
+
+    def _get_frames(self):
+        # NOTE: each thread has a stack of the measures and renders in
+        #       progress, whose top frame is the control whose cached
+        #       method is running. A frame holds the control, whether
+        #       its core method was called, and whether its render was
+        #       found in the shared render cache.
+        try:
+            return self._local.frames
+        except (AttributeError) as e:
+            frames = self._local.frames = list()
+            return frames
+
+    def _get_frame(self, control):
+        frames = self._get_frames()
+
+        if frames and frames[-1][0] is control:
+            return frames[-1]
+
+        return None
+
+    def _get_updating(self):
+        # NOTE: each thread has the set of the identities of the
+        #       controls whose update is in progress, whose setters are
+        #       not counted, since the update counts their invalidations.
+        try:
+            return self._local.updating
+        except (AttributeError) as e:
+            updating = self._local.updating = set()
+            return updating
+
+    def _count_shared_hit(self, control):
+        frame = self._get_frame(control)
+
+        if frame is not None:
+            frame[2] = True
+            self._get_counters(control.__class__).render_shared_hits += 1
+
+    def _patch(self, cls, name, value):
+        self._originals.append((cls, name, cls.__dict__[name]))
+        type.__setattr__(cls, name, value)
+
+    def _instrument_class(self, cls):
+        for (name, p) in cls.__control_property_map__.items():
+            descriptor = cls.__dict__.get(name)
+
+            if descriptor is None:
+                continue
+
+            setter = self._build_setter(descriptor.fset, p)
+            self._patch(cls, name, descriptor.setter(setter))
+
+        for (name, build) in (
+            ("measure_core", self._build_measure_core),
+            ("render_core", self._build_render_core),
+        ):
+            method = cls.__dict__.get(name)
+
+            # NOTE: abstract methods are left alone, so that classes
+            #       which do not implement them stay abstract.
+            if method is None or getattr(method, "__isabstractmethod__", False):
+                continue
+
+            self._patch(cls, name, build(method))
+
+    def _build_evict(self, evict):
+        def _evict(cache):
+            # NOTE: only evictions caused by the insertions which follow
+            #       a call of a core method are counted, see _get_frames.
+            frames = self._get_frames()
+
+            if frames and frames[-1][1]:
+                (control, _, _, kind) = frames[-1]
+                counters = self._get_counters(control.__class__)
+
+                if kind == "measure":
+                    counters.measure_evictions += 1
+                else:
+                    counters.render_evictions += 1
+
+            return evict(cache)
+
+        return _evict
+
+    def _build_setter(self, fset, p):
+        attr = f"_{p.name}"
+
+        def setter(control, value):
+            before = getattr(control, attr)
+            fset(control, value)
+            after = getattr(control, attr)
+
+            # NOTE: a setter only replaces the value when it is
+            #       modified, and only invalidates the control when the
+            #       invalidation flags of the property say so.
+            if (
+                after is not before
+                and _invalidates(p, before, after)
+                and id(control) not in self._get_updating()
+            ):
+                self._get_counters(control.__class__).invalidations[p.name] += 1
+
+        return setter
+
+    def _build_update(self, update):
+        def update_(control, **changes):
+            before = {name: getattr(control, f"_{name}", None) for name in changes}
+
+            updating = self._get_updating()
+            updating.add(id(control))
+
+            try:
+                update(control, **changes)
+            finally:
+                updating.discard(id(control))
+
+            properties = control.__class__.__control_property_map__
+            counters = None
+
+            for (name, value) in before.items():
+                after = getattr(control, f"_{name}")
+
+                if after is not value and _invalidates(properties[name], value, after):
+                    counters = counters or self._get_counters(control.__class__)
+                    counters.invalidations[name] += 1
+
+        update_.__doc__ = update.__doc__
+        return update_
+
+    def _build_measure(self, measure):
+        def measure_(control, h, w):
+            frame = [control, False, False, "measure"]
+            frames = self._get_frames()
+            frames.append(frame)
+
+            try:
+                return measure(control, h, w)
+            finally:
+                frames.pop()
+
+                if not frame[1]:
+                    self._get_counters(control.__class__).measure_hits += 1
+
+        measure_.__doc__ = measure.__doc__
+        return measure_
+
+    def _build_measure_core(self, measure_core):
+        clock = self._clock
+
+        def measure_core_(control, h, w):
+            frame = self._get_frame(control)
+
+            if frame is None:
+                return measure_core(control, h, w)
+
+            counters = self._get_counters(control.__class__)
+            counters.measure_misses += 1
+
+            start = clock()
+            value = measure_core(control, h, w)
+            counters.measure_time += clock() - start
+
+            frame[1] = True
+            return value
+
+        measure_core_.__doc__ = measure_core.__doc__
+        return measure_core_
+
+    def _build_render(self, render):
+        def render_(control, h, w):
+            frame = [control, False, False, "render"]
+            frames = self._get_frames()
+            frames.append(frame)
+
+            try:
+                value = render(control, h, w)
+            finally:
+                frames.pop()
+
+                if not frame[1] and not frame[2]:
+                    self._get_counters(control.__class__).render_hits += 1
+
+            self.poll()
+
+            return value
+
+        render_.__doc__ = render.__doc__
+        return render_
+
+    def _build_render_core(self, render_core):
+        clock = self._clock
+
+        def render_core_(control, h, w):
+            frame = self._get_frame(control)
+
+            if frame is None:
+                return render_core(control, h, w)
+
+            counters = self._get_counters(control.__class__)
+            counters.render_misses += 1
+
+            # NOTE: the rows are consumed here, so that the time spent
+            #       rendering them is counted.
+            start = clock()
+            value = tuple(render_core(control, h, w))
+            counters.render_time += clock() - start
+
+            frame[1] = True
+            return value
+
+        render_core_.__doc__ = render_core.__doc__
+        return render_core_
+
+
+__all__ = [
+    "Instrumentation",
+]
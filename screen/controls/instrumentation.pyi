@@ -0,0 +1,26 @@
+from typing import Any, Callable, Dict, Optional
+
+
+class Instrumentation:
+    callback: Optional[Callable[[Dict[str, Any]], Any]]
+    interval: float
+
+    def __init__(
+        self,
+        *,
+        callback: Optional[Callable[[Dict[str, Any]], Any]]=...,
+        interval: float=...,
+        clock: Callable[[], float]=...,
+    ) -> None: ...
+
+    def __enter__(self) -> Instrumentation: ...
+    def __exit__(self, *exc_info: Any) -> None: ...
+
+    @property
+    def enabled(self) -> bool: ...
+
+    def enable(self) -> None: ...
+    def disable(self) -> None: ...
+    def reset(self) -> None: ...
+    def snapshot(self, *, reset: bool=...) -> Dict[str, Any]: ...
+    def poll(self) -> bool: ...
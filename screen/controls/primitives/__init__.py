@@ -1,5 +1,7 @@
 from screen.controls.primitives.alignment import *
 from screen.controls.primitives.alignment import __all__ as _alignment__all__
+from screen.controls.primitives.arrangement import *
+from screen.controls.primitives.arrangement import __all__ as _arrangement__all__
 from screen.controls.primitives.boundary import *
 from screen.controls.primitives.boundary import __all__ as _boundary__all__
 from screen.controls.primitives.bullet import *
@@ -10,6 +12,8 @@ from screen.controls.primitives.orientation import *
 from screen.controls.primitives.orientation import __all__ as _orientation__all__
 from screen.controls.primitives.placement import *
 from screen.controls.primitives.placement import __all__ as _placement__all__
+from screen.controls.primitives.rectangle import *
+from screen.controls.primitives.rectangle import __all__ as _rectangle__all__
 from screen.controls.primitives.size import *
 from screen.controls.primitives.size import __all__ as _size__all__
 from screen.controls.primitives.thickness import *
@@ -18,11 +22,13 @@ from screen.controls.primitives.thickness import __all__ as _thickness__all__
 
 __all__ = [
     *_alignment__all__,
+    *_arrangement__all__,
     *_boundary__all__,
     *_bullet__all__,
     *_case__all__,
     *_orientation__all__,
     *_placement__all__,
+    *_rectangle__all__,
     *_size__all__,
     *_thickness__all__,
 ]
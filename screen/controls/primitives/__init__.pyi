@@ -1,8 +1,10 @@
 from screen.controls.primitives.alignment import HorizontalAlignment as HorizontalAlignment, VerticalAlignment as VerticalAlignment
+from screen.controls.primitives.arrangement import Arrangement as Arrangement
 from screen.controls.primitives.boundary import Boundary as Boundary
 from screen.controls.primitives.bullet import Bullet as Bullet
 from screen.controls.primitives.case import Case as Case
 from screen.controls.primitives.orientation import Orientation as Orientation
 from screen.controls.primitives.placement import Placement as Placement
+from screen.controls.primitives.rectangle import Rectangle as Rectangle
 from screen.controls.primitives.size import Size as Size
 from screen.controls.primitives.thickness import Thickness as Thickness
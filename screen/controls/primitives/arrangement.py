@@ -0,0 +1,65 @@
+from .rectangle import Rectangle
+
+
+class Arrangement:
+    """
+    Represents the result of arranging a control.
+
+    Arrangements are cached by the control they belong to, and are
+    shared by the arrangements of its ancestors. The rectangles are
+    therefore relative; use :meth:`~.flatten` to calculate absolute
+    rectangles.
+
+    Attributes
+    ----------
+    control: :class:`~screen.controls.Control`
+        The arranged control.
+    rectangle: :class:`~.Rectangle`
+        The rectangle of the control, relative to the slot it was
+        arranged in.
+    children: Tuple[Tuple[:class:`int`, :class:`int`, :class:`~.Arrangement`], ...]
+        The top, left, and arrangement of each child slot, relative to
+        :attr:`~.rectangle`, ordered by :attr:`Control.layer \
+        <screen.controls.Control.layer>`.
+    """
+
+    __slots__ = ("control", "rectangle", "children")
+
+    def __init__(self, control, rectangle, children):
+        self.control = control
+        self.rectangle = rectangle
+        self.children = children
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} control={self.control!r} rectangle={self.rectangle!r}>"
+
+    def flatten(self, top=0, left=0):
+        """
+        Calculates the absolute rectangle of the control and each of
+        its descendants, in drawing order.
+
+        Parameters
+        ----------
+        top: :class:`int`
+            The top row of the slot.
+        left: :class:`int`
+            The left column of the slot.
+
+        Returns
+        -------
+        Iterator[Tuple[:class:`~screen.controls.Control`, :class:`~.Rectangle`]]
+            An iterator yielding each control and its rectangle.
+        """
+
+        r = self.rectangle
+        rectangle = Rectangle(top + r.top, left + r.left, r.height, r.width)
+
+        yield (self.control, rectangle)
+
+        for (t, l, arrangement) in self.children:
+            yield from arrangement.flatten(rectangle.top + t, rectangle.left + l)
+
+
+__all__ = [
+    "Arrangement",
+]
@@ -0,0 +1,12 @@
+from typing import Any, Iterator, Tuple
+
+from screen.controls.primitives.rectangle import Rectangle
+
+
+class Arrangement():
+    control: Any
+    rectangle: Rectangle
+    children: Tuple[Tuple[int, int, Arrangement], ...]
+
+    def __init__(self, control: Any, rectangle: Rectangle, children: Tuple[Tuple[int, int, Arrangement], ...]) -> None: ...
+    def flatten(self, top: int=..., left: int=...) -> Iterator[Tuple[Any, Rectangle]]: ...
@@ -11,10 +11,15 @@ class Boundary(Enum):
         The character boundary.
     word
         The word boundary.
+    optimal
+        The word boundary. When wrapping, line breaks are chosen to
+        minimize the raggedness of the whole paragraph instead of
+        filling each line in turn.
     """
 
     character = 1
     word = 2
+    optimal = 3
 
 
 __all__ = [
@@ -4,3 +4,4 @@ from enum import Enum
 class Boundary(Enum):
     character: int
     word: int
+    optimal: int
@@ -0,0 +1,90 @@
+class Rectangle:
+    """
+    Represents a rectangle.
+
+    Parameters
+    ----------
+    top: :class:`int`
+        The top row.
+    left: :class:`int`
+        The left column.
+    height: :class:`int`
+        The height.
+    width: :class:`int`
+        The width.
+
+
+    .. container:: operations
+
+        .. describe:: x == y
+        .. describe:: x != y
+
+            Compares two :class:`~.Rectangle` objects.
+
+        .. describe:: hash(x)
+
+            Returns the hash of the :class:`~.Rectangle` object.
+
+    Attributes
+    ----------
+    top: :class:`int`
+        The top row.
+    left: :class:`int`
+        The left column.
+    height: :class:`int`
+        The height.
+    width: :class:`int`
+        The width.
+    """
+
+    __slots__ = ("top", "left", "height", "width")
+
+    def __init__(self, top, left, height, width):
+        self.top = top
+        self.left = left
+        self.height = height
+        self.width = width
+
+    def __hash__(self):
+        return hash((self.top, self.left, self.height, self.width))
+
+    def __repr__(self):
+        return (
+            f"<Rectangle top={self.top} left={self.left} height={self.height} width={self.width}>"
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+
+        return (
+            self.top == other.top
+            and self.left == other.left
+            and self.height == other.height
+            and self.width == other.width
+        )
+
+    @property
+    def bottom(self):
+        """
+        The row below the rectangle.
+
+        :type: :class:`int`
+        """
+
+        return self.top + self.height
+
+    @property
+    def right(self):
+        """
+        The column to the right of the rectangle.
+
+        :type: :class:`int`
+        """
+
+        return self.left + self.width
+
+
+__all__ = [
+    "Rectangle",
+]
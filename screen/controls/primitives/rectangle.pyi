@@ -0,0 +1,12 @@
+class Rectangle():
+    top: int
+    left: int
+    height: int
+    width: int
+
+    def __init__(self, top: int, left: int, height: int, width: int) -> None: ...
+
+    @property
+    def bottom(self) -> int: ...
+    @property
+    def right(self) -> int: ...
@@ -1,14 +1,72 @@
 from typing import List, Union
 
+import array
+import builtins
+import threading
+
 from screen.controls import Control, property
 from screen.controls.primitives import Bullet, Orientation
 from screen.utils import len
+from screen.utils.internal import FenwickTree
 
 
 def _bullet_invalidate_measure(before, after):
     return not (isinstance(before, str) and isinstance(after, str) and len(before) == len(after))
 
 
+class _Unlocked:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+# NOTE: only snapshots, which can be shared by the snapshots of several
+#       roots and rendered by several threads, lock their layout state.
+_unlocked = _Unlocked()
+
+
+class _StackExtents:
+    __slots__ = ("bullet_width", "children", "indices", "measured", "stale", "tree")
+
+    def __init__(self, children, estimate, bullet_width):
+        self.bullet_width = bullet_width
+        self.children = children
+        self.indices = None
+        self.measured = bytearray(builtins.len(children))
+        self.stale = list()
+        self.tree = FenwickTree([estimate] * builtins.len(children))
+
+    def index(self, child):
+        if self.indices is None:
+            self.indices = {id(c): i for (i, c) in enumerate(self.children)}
+
+        return self.indices[id(child)]
+
+    def splice(self, index, removed, inserted, estimate):
+        n = builtins.len(self.measured)
+        stop = index + builtins.len(removed)
+
+        self.tree.splice(index, builtins.len(removed), [estimate] * inserted)
+        self.measured[index:stop] = bytes(inserted)
+
+        if self.indices is None:
+            return
+
+        if stop == n:
+            for child in removed:
+                self.indices.pop(id(child), None)
+
+            for i in range(index, index + inserted):
+                self.indices[id(self.children[i])] = i
+        else:
+            # NOTE: the indices after the change have shifted.
+            self.indices = None
+
+
 class Stack(Control):
     """
     Represents a control used to display a stack of controls.
@@ -28,14 +86,314 @@ class Stack(Control):
     """
 
     # fmt: off
-    bullet      = property(Union[Bullet, str], Bullet.none,            True,  _bullet_invalidate_measure, True)
-    children    = property(List[Control],      None,                   False, True,                       True)
-    orientation = property(Orientation,        Orientation.horizontal, True,  True,                       True)
-    spacing     = property(int,                0,                      True,  True,                       True)
+    bullet           = property(Union[Bullet, str], Bullet.none,            True,  _bullet_invalidate_measure, True)
+    children         = property(List[Control],      None,                   False, True,                       True)
+    estimated_extent = property(int,                1,                      True,  True,                       False, "The estimated extent of a child which has not been measured yet. Only used when the stack is virtualized.")
+    orientation      = property(Orientation,        Orientation.horizontal, True,  True,                       True)
+    spacing          = property(int,                0,                      True,  True,                       True)
+    virtualized      = property(bool,               False,                  True,  True,                       True,  "Whether the stack only measures the children near its viewport.")
     # fmt: on
 
+    __slots__ = ("_bullet_widths", "_extents", "_lock")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self._bullet_widths = None
+        self._extents = dict()
+        self._lock = _unlocked
+
+    def _invalidate(self, measure, render):
+        if measure:
+            self._extents.clear()
+
+        self._bullet_widths = None
+
+        super()._invalidate(measure, render)
+
+    def _create_snapshot(self):
+        snapshot = super()._create_snapshot()
+        snapshot._bullet_widths = None
+        snapshot._extents = dict()
+        snapshot._lock = threading.RLock()
+        return snapshot
+
+    def _children_changed(self, name, index, removed, inserted):
+        children = self._children
+        bullet_width = self._get_bullet_width()
+        estimate = self._estimated_extent + self._spacing
+        vertical = self._orientation == Orientation.vertical
+
+        for (cross, extents) in list(self._extents.items()):
+            if extents.children is not children or extents.bullet_width != bullet_width:
+                del self._extents[cross]
+                continue
+
+            extents.splice(index, removed, inserted, estimate)
+
+            if not self._virtualized:
+                h, w = (None, cross) if vertical else (cross, None)
+
+                for i in range(index, index + inserted):
+                    self._measure_child(extents, i, h, w)
+
+        # NOTE: the extents were updated in place, so they must not be
+        #       cleared by Stack._invalidate.
+        Control._invalidate(self, True, True)
+
+    def _child_measure_invalidated(self, child):
+        # NOTE: the previous extent of the child is kept as its
+        #       estimate, so offsets only change once it is measured
+        #       again, which a stack which is not virtualized does the
+        #       next time its extents are used, see _get_extents.
+        for extents in self._extents.values():
+            try:
+                extents.measured[extents.index(child)] = 0
+            except (KeyError) as e:
+                continue
+
+            if not self._virtualized:
+                extents.stale.append(child)
+
+    def _get_extents(self, h, w):
+        cross = w if self._orientation == Orientation.vertical else h
+        children = self._children
+
+        try:
+            extents = self._extents[cross]
+        except (KeyError) as e:
+            extents = None
+
+        if (
+            extents is None
+            or extents.children is not children
+            or builtins.len(extents.tree) != builtins.len(children)
+        ):
+            extents = _StackExtents(
+                children,
+                self._estimated_extent + self._spacing,
+                self._get_bullet_width(),
+            )
+            self._extents[cross] = extents
+
+            if not self._virtualized:
+                for i in range(builtins.len(children)):
+                    self._measure_child(extents, i, h, w)
+        elif extents.stale:
+            stale = extents.stale
+            extents.stale = list()
+
+            for child in stale:
+                try:
+                    i = extents.index(child)
+                except (KeyError) as e:
+                    continue
+
+                if not extents.measured[i]:
+                    self._measure_child(extents, i, h, w)
+
+        return extents
+
+    def _measure_child(self, extents, i, h, w):
+        child = extents.children[i]
+        b = extents.bullet_width
+
+        if self._orientation == Orientation.vertical:
+            size = child.layout_size(None, None if w is None else max(w - b, 0))[0]
+        else:
+            size = b + child.layout_size(h, None)[1]
+
+        extents.tree[i] = size + self._spacing
+        extents.measured[i] = 1
+
+    def _get_bullet(self, i):
+        bullet = self._bullet
+
+        if isinstance(bullet, str):
+            return bullet
+
+        return bullet(i + 1)
+
+    def _get_bullet_width(self):
+        n = builtins.len(self._children)
+
+        # NOTE: the widest bullet only depends on the number of
+        #       children, so the widest bullet of each prefix is kept
+        #       and appending a child only measures its bullet.
+        widths = self._bullet_widths
+        if widths is None:
+            widths = self._bullet_widths = array.array("q", [0])
+
+        while builtins.len(widths) <= n:
+            widths.append(max(widths[-1], len(self._get_bullet(builtins.len(widths) - 1))))
+
+        # NOTE: bullets are separated from their child by one column.
+        width = widths[n]
+        return width + 1 if width else 0
+
+    def locate(self, h, w, offset):
+        """
+        Finds the child at an offset along the stack's
+        :attr:`~.orientation`, in O(log n).
+
+        Children which have not been measured yet are assumed to be
+        :attr:`~.estimated_extent` long.
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The available height.
+        w: :class:`int`
+            The available width.
+        offset: :class:`int`
+            The offset.
+
+        Returns
+        -------
+        Tuple[:class:`int`, :class:`int`]
+            The index of the child and its offset.
+        """
+
+        if not self._children:
+            raise IndexError("stack has no children")
+
+        with self._lock:
+            tree = self._get_extents(h, w).tree
+
+            i = tree.search(offset)
+            return (i, tree.prefix(i))
+
+    def visible_children(self, h, w, offset, extent):
+        """
+        Finds the children overlapping a range along the stack's
+        :attr:`~.orientation`.
+
+        Only the children in the range are measured. Offsets are kept
+        in a binary indexed tree, so finding the first visible child
+        costs O(log n) and measuring a child updates the offsets of
+        the children after it in O(log n).
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The available height.
+        w: :class:`int`
+            The available width.
+        offset: :class:`int`
+            The start of the range.
+        extent: :class:`int`
+            The length of the range.
+
+        Returns
+        -------
+        List[Tuple[:class:`int`, :class:`~.Control`, :class:`int`, :class:`int`]]
+            The index, child, offset, and extent of each visible child.
+        """
+
+        children = self._children
+        if not children:
+            return []
+
+        with self._lock:
+            extents = self._get_extents(h, w)
+            tree = extents.tree
+            spacing = self._spacing
+
+            visible = list()
+
+            i = tree.search(offset)
+            position = tree.prefix(i)
+
+            while i < builtins.len(children) and position < offset + extent:
+                if not extents.measured[i]:
+                    self._measure_child(extents, i, h, w)
+
+                size = tree[i]
+
+                if position + size > offset:
+                    visible.append((i, children[i], position, size - spacing))
+
+                position += size
+                i += 1
+
+        return visible
+
     def measure_core(self, h, w):
-        raise NotImplementedError
+        children = self._children
+        if not children:
+            return (0, 0)
+
+        vertical = self._orientation == Orientation.vertical
+
+        if self._virtualized:
+            # NOTE: a virtualized stack only knows the extents of the
+            #       children it has measured, and estimates the rest.
+            with self._lock:
+                extent = self._get_extents(h, w).tree.total() - self._spacing
+
+            if vertical:
+                return (extent, w or 0)
+            else:
+                return (h or 0, extent)
+
+        with self._lock:
+            b = self._get_bullet_width()
+
+        spacing = self._spacing * (builtins.len(children) - 1)
+
+        if vertical:
+            w = None if w is None else max(w - b, 0)
+            sizes = [c.layout_size(None, w) for c in children]
+
+            return (sum(s[0] for s in sizes) + spacing, max(s[1] for s in sizes) + b)
+        else:
+            sizes = [c.layout_size(h, None) for c in children]
+
+            return (max(s[0] for s in sizes), sum(b + s[1] for s in sizes) + spacing)
+
+    def arrange_core(self, h, w):
+        children = self._children
+        if not children:
+            return
+
+        vertical = self._orientation == Orientation.vertical
+
+        if self._virtualized:
+            # NOTE: a virtualized stack only arranges the children it has
+            #       measured, see visible_children.
+            with self._lock:
+                extents = self._get_extents(h, w)
+                b = extents.bullet_width
+                tree = extents.tree
+
+                measured = [
+                    (child, tree.prefix(i), tree[i] - self._spacing)
+                    for (i, child) in enumerate(children)
+                    if extents.measured[i]
+                ]
+
+            for (child, position, size) in measured:
+                if vertical:
+                    yield (position, b, child.arrange(size, max(w - b, 0)))
+                else:
+                    yield (0, position + b, child.arrange(h, max(size - b, 0)))
+
+            return
+
+        with self._lock:
+            b = self._get_bullet_width()
+
+        position = 0
+
+        for child in children:
+            if vertical:
+                size = child.layout_size(None, max(w - b, 0))[0]
+                yield (position, b, child.arrange(size, max(w - b, 0)))
+            else:
+                size = b + child.layout_size(h, None)[1]
+                yield (0, position + b, child.arrange(h, size - b))
+
+            position += size + self._spacing
 
     def render_core(self, h, w):
         raise NotImplementedError
@@ -1,4 +1,4 @@
-from typing import ClassVar, List, Optional, Union
+from typing import ClassVar, List, Optional, Sequence, Tuple, Union
 
 from screen.controls import Control
 from screen.controls.primitives import Bullet, Orientation
@@ -6,16 +6,20 @@ from screen.controls.primitives import Bullet, Orientation
 
 class Stack(Control):
     default_bullet: ClassVar[Union[Bullet, str]]
+    default_estimated_extent: ClassVar[int]
     default_orientation: ClassVar[Orientation]
     default_spacing: ClassVar[int]
+    default_virtualized: ClassVar[bool]
 
     def __init__(
         self,
         *,
         children: List[Control],
         bullet: Union[Bullet, str]=...,
+        estimated_extent: int=...,
         orientation: Orientation=...,
         spacing: int=...,
+        virtualized: bool=...,
         **kwargs,
     ) -> None: ...
 
@@ -24,10 +28,14 @@ class Stack(Control):
     @bullet.setter
     def bullet(self, value: Optional[Union[Bullet, str]]) -> None: ...
     @property
-    def children(self) -> List[Control]: ...
+    def children(self) -> Sequence[Control]: ...
     @children.setter
     def children(self, value: List[Control]) -> None: ...
     @property
+    def estimated_extent(self) -> int: ...
+    @estimated_extent.setter
+    def estimated_extent(self, value: Optional[int]) -> None: ...
+    @property
     def orientation(self) -> Orientation: ...
     @orientation.setter
     def orientation(self, value: Optional[Orientation]) -> None: ...
@@ -35,3 +43,10 @@ class Stack(Control):
     def spacing(self) -> int: ...
     @spacing.setter
     def spacing(self, value: Optional[int]) -> None: ...
+    @property
+    def virtualized(self) -> bool: ...
+    @virtualized.setter
+    def virtualized(self, value: Optional[bool]) -> None: ...
+
+    def locate(self, h: int, w: int, offset: int) -> Tuple[int, int]: ...
+    def visible_children(self, h: int, w: int, offset: int, extent: int) -> List[Tuple[int, Control, int, int]]: ...
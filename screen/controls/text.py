@@ -1,13 +1,313 @@
 from typing import Optional
 
-from screen.controls import Control, property
+import array
+import bisect
+import builtins
+import re
+
+from screen.controls import Control, _slice_columns, property
 from screen.controls.primitives import Boundary, Case, HorizontalAlignment, VerticalAlignment
+from screen.utils import WidthIndex, len, normalize
+
+
+_ellipsis = "…"
+_word = re.compile(r"\S+")
+
+
+class _Paragraph:
+    # NOTE: a paragraph is split into the clusters of its width index,
+    #       and into segments, which are the runs of clusters between
+    #       two break opportunities.
+    __slots__ = ("columns", "end_columns", "ends", "offsets", "starts", "text")
+
+    def __init__(self, text, boundary):
+        index = WidthIndex(text)
+        offsets = index.offsets
+        columns = index.columns
+
+        n = builtins.len(offsets) - 1
+
+        if boundary == Boundary.character:
+            starts = array.array("I", range(n))
+            ends = array.array("I", range(1, n + 1))
+        elif offsets is columns:
+            # NOTE: each character of the paragraph is a cluster of one
+            #       column, see screen.utils.WidthIndex.
+            spans = [i for m in _word.finditer(text) for i in m.span()]
+            starts = array.array("I", spans[0::2])
+            ends = array.array("I", spans[1::2])
+        else:
+            starts = array.array("I")
+            ends = array.array("I")
+            word = False
+
+            for i in range(n):
+                space = text[offsets[i]].isspace()
+
+                if word and space:
+                    ends.append(i)
+                elif not word and not space:
+                    starts.append(i)
+
+                word = not space
+
+            if word:
+                ends.append(n)
+
+        self.columns = columns
+        self.end_columns = (
+            ends if offsets is columns else array.array("I", [columns[i] for i in ends])
+        )
+        self.ends = ends
+        self.offsets = offsets
+        self.starts = starts
+        self.text = text
+
+    def slice(self, start, stop):
+        return self.text[self.offsets[start] : self.offsets[stop]]
+
+    def wrap(self, w):
+        columns = self.columns
+        ends = self.ends
+        end_columns = self.end_columns
+
+        # NOTE: the whitespace at the start of a paragraph is kept, but
+        #       the whitespace around other line breaks is not. Each
+        #       line has the width from its start to the end of the next
+        #       segment, which is the narrowest width at which the line
+        #       takes that segment, or None for the last line.
+        lines = list()
+        start = 0
+        i = 0
+
+        while i < builtins.len(ends):
+            limit = columns[start] + w
+            j = bisect.bisect_right(end_columns, limit, i) - 1
+
+            if j >= i:
+                i = j + 1
+
+                if i < builtins.len(ends):
+                    lines.append((start, ends[j], end_columns[i] - columns[start]))
+                    start = self.starts[i]
+                else:
+                    lines.append((start, ends[j], None))
+
+                continue
+
+            # NOTE: a segment wider than the line is broken between
+            #       clusters, with at least one cluster per line, which
+            #       depends on the exact width of the line.
+            stop = max(bisect.bisect_right(columns, limit, start) - 1, start + 1)
+            lines.append((start, stop, 0))
+            start = stop
+
+            if start == ends[i]:
+                i += 1
+
+                if i < builtins.len(ends):
+                    start = self.starts[i]
+
+        if not lines:
+            lines.append((0, 0, None))
+
+        return lines
+
+    def wrap_optimal(self, w):
+        columns = self.columns
+
+        # NOTE: segments wider than the line are split between clusters
+        #       beforehand, so that every piece fits on a line.
+        starts = array.array("I")
+        ends = array.array("I")
+
+        for (start, end) in zip(self.starts, self.ends):
+            while columns[end] - columns[start] > w:
+                stop = max(bisect.bisect_right(columns, columns[start] + w, start) - 1, start + 1)
+                starts.append(start)
+                ends.append(stop)
+                start = stop
+
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+
+        n = builtins.len(ends)
+
+        if not n:
+            return [(0, 0, None)]
+
+        # NOTE: the whitespace at the start of a paragraph is kept.
+        starts[0] = 0
+        start_columns = array.array("I", (columns[i] for i in starts))
+
+        # NOTE: the cost of a paragraph is the sum of the squared free
+        #       space of its lines, except the last one. Only the breaks
+        #       from which the line fits are candidates, which are found
+        #       by bisecting the start columns, so this takes O(n * w)
+        #       rather than O(n ** 2) time.
+        costs = [0] * n
+        breaks = [0] * n
+
+        for j in range(1, n):
+            end = columns[ends[j - 1]]
+            first = min(bisect.bisect_left(start_columns, end - w, 0, j), j - 1)
+            slack = w - end
+
+            (costs[j], breaks[j]) = min(
+                (costs[i] + (slack + start_columns[i]) ** 2, i) for i in range(first, j)
+            )
+
+        # NOTE: the last line is free, so it starts at the cheapest
+        #       break from which the rest of the paragraph fits.
+        end = columns[ends[-1]]
+        first = min(bisect.bisect_left(start_columns, end - w), n - 1)
+
+        (_, last) = min((costs[i], i) for i in range(first, n))
+
+        # NOTE: the breaks depend on the exact width of the lines, unless
+        #       the paragraph fits on one line, see _Paragraph.wrap.
+        lines = [(starts[last], ends[-1], 0 if last else None)]
+        j = last
+
+        while j:
+            i = breaks[j]
+            lines.append((starts[i], ends[j - 1], 0))
+            j = i
+
+        lines.reverse()
+        return lines
+
+    def widest(self):
+        # NOTE: the first segment is preceded by the whitespace at the
+        #       start of the paragraph, which is kept.
+        widths = [e - self.columns[i] for (i, e) in zip(self.starts, self.end_columns)]
+
+        if widths:
+            widths[0] = self.end_columns[0]
+
+        return max(widths, default=0)
+
+    def trim(self, start, stop, w, boundary):
+        # NOTE: the end of the line is moved back to the last boundary
+        #       which leaves room for the ellipsis.
+        limit = self.columns[start] + w - len(_ellipsis)
+
+        if boundary != Boundary.character:
+            i = bisect.bisect_right(self.end_columns, limit) - 1
+
+            if i >= 0 and self.ends[i] > start:
+                return min(self.ends[i], stop)
+
+        return max(min(bisect.bisect_right(self.columns, limit, start) - 1, stop), start)
+
+
+class _TextLayout:
+    # NOTE: the analysis of the content only depends on the content,
+    #       case, and wrap boundary of the text, so it is shared by all
+    #       widths. The lines of the last wrapped width are kept, since
+    #       a text is usually measured and rendered at the same width.
+    __slots__ = ("boundary", "case", "content", "lines", "paragraphs", "widest", "width")
+
+    def __init__(self, content, case, boundary):
+        self.boundary = boundary
+        self.case = case
+        self.content = content
+        self.lines = None
+        self.widest = None
+        self.paragraphs = tuple(
+            _Paragraph(text, boundary) for text in normalize(case(content)).split("\r\n")
+        )
+        self.width = max(p.columns[-1] for p in self.paragraphs)
+
+    def wrap(self, w):
+        # NOTE: returns the width, the lines, the width of the widest
+        #       line, and the greatest width at which the same lines are
+        #       wrapped, which is None when there is no such width.
+        wrapped = self.lines
+
+        if wrapped is not None and wrapped[0] == w:
+            return wrapped
+
+        lines = list()
+        width = 0
+        high = None
+        optimal = self.boundary == Boundary.optimal
+
+        for p in self.paragraphs:
+            paragraph = p.wrap_optimal(max(w, 1)) if optimal else p.wrap(max(w, 1))
+
+            n = builtins.len(paragraph) - 1
+
+            for (i, (start, stop, extent)) in enumerate(paragraph):
+                columns = p.columns[stop] - p.columns[start]
+                lines.append((p, start, stop, columns, i == n))
+
+                if columns > width:
+                    width = columns
+
+                if extent is not None and (high is None or extent <= high):
+                    high = extent - 1
+
+        wrapped = self.lines = (w, lines, width, high)
+        return wrapped
+
+    def bounds(self):
+        # NOTE: below the width of the widest segment, a segment is
+        #       broken, and above the width of the widest paragraph,
+        #       each paragraph is on one line.
+        if self.widest is None:
+            self.widest = max(p.widest() for p in self.paragraphs)
+
+        return (self.widest, self.width)
+
+    def interval(self, w):
+        (_, _, width, high) = self.wrap(w)
+
+        # NOTE: the lines are the same at every width at which each line
+        #       fits but does not take its next segment, unless a line
+        #       depends on the exact width, see _Paragraph.wrap.
+        if width > max(w, 1) or (high is not None and high < max(w, 1)):
+            return None
+
+        # NOTE: widths below one column are wrapped as one column.
+        return (0 if width <= 1 else width, high)
+
+
+def _justify(line, w):
+    words = line.split()
+
+    if builtins.len(words) < 2:
+        return line
+
+    gaps = builtins.len(words) - 1
+    space, extra = divmod(w - sum(len(word) for word in words), gaps)
+
+    return "".join(
+        word + " " * (space + (i < extra)) if i < gaps else word for (i, word) in enumerate(words)
+    )
 
 
 class Text(Control):
     """
     Represents a control used to display text.
 
+    The content is analyzed once for each combination of
+    :attr:`~.content`, :attr:`~.case`, and :attr:`~.wrap_boundary`:
+    the content is :func:`normalized <screen.utils.normalize>`, and
+    the widths of its characters and its break opportunities are
+    calculated. Wrapping the content at any width only uses the result
+    of this analysis, so resizing a text does not analyze its content
+    again. Unless the content is wrapped at the
+    :attr:`~screen.controls.primitives.Boundary.optimal` boundary, the
+    size of a text is also cached over the interval of widths which
+    wrap its content into the same lines, see
+    :meth:`~.measure_interval_core`.
+
+    When fitting a text with :meth:`~.fit_width`, its content is not
+    broken within a word, unless the content is wrapped at the
+    :attr:`~screen.controls.primitives.Boundary.character` boundary.
+
     |parameters|
 
     .. container:: operations
@@ -31,11 +331,107 @@ class Text(Control):
     wrap_boundary             = property(Boundary,            Boundary.word,            True,  True,  True)
     # fmt: on
 
+    __slots__ = ("_layout",)
+
+    def _get_layout(self):
+        try:
+            layout = self._layout
+        except (AttributeError) as e:
+            layout = None
+
+        if (
+            layout is None
+            or layout.content != self._content
+            or layout.case != self._case
+            or layout.boundary != self._wrap_boundary
+        ):
+            layout = self._layout = _TextLayout(self._content, self._case, self._wrap_boundary)
+
+        return layout
+
+    def _create_snapshot(self):
+        snapshot = super()._create_snapshot()
+
+        try:
+            snapshot._layout = self._layout
+        except (AttributeError) as e:
+            pass
+
+        return snapshot
+
     def measure_core(self, h, w):
-        raise NotImplementedError
+        layout = self._get_layout()
+
+        if w is None:
+            return (builtins.len(layout.paragraphs), layout.width)
+
+        (_, lines, width, _) = layout.wrap(w)
+        return (builtins.len(lines), width)
+
+    def measure_interval_core(self, h, w):
+        return self._get_layout().interval(w)
+
+    def width_bounds_core(self, h):
+        return self._get_layout().bounds()
+
+    def _render_line(self, lines, i, h, w):
+        (p, start, stop, width, last) = lines[i]
+        trimmed = i == h - 1 and builtins.len(lines) > h
+
+        if trimmed:
+            stop = p.trim(start, stop, w, self._trim_boundary)
+            width = p.columns[stop] - p.columns[start] + len(_ellipsis)
+
+        line = p.slice(start, stop) + (_ellipsis if trimmed else "")
+
+        if width > w:
+            line = _slice_columns(line, 0, w)
+            width = w
+
+        alignment = self._horizontal_text_alignment
+
+        if alignment == HorizontalAlignment.center:
+            left = (w - width) // 2
+        elif alignment == HorizontalAlignment.right:
+            left = w - width
+        elif alignment == HorizontalAlignment.stretch and not last and not trimmed:
+            line = _justify(line, w)
+            left = 0
+            width = len(line)
+        else:
+            left = 0
+
+        return " " * left + line + " " * (w - width - left)
 
     def render_core(self, h, w):
-        raise NotImplementedError
+        return self.render_rows_core(h, w, 0, h)
+
+    def render_rows_core(self, h, w, start, stop):
+        # NOTE: only the requested rows are rendered from the wrapped
+        #       lines, so a viewport into a long text does not render
+        #       the whole text.
+        (_, lines, _, _) = self._get_layout().wrap(w)
+
+        count = min(builtins.len(lines), h)
+        space = h - count
+        alignment = self._vertical_text_alignment
+
+        if alignment == VerticalAlignment.center:
+            top = space // 2
+        elif alignment == VerticalAlignment.bottom:
+            top = space
+        else:
+            top = 0
+
+        blank = " " * w
+
+        for row in range(max(start, 0), min(stop, h)):
+            i = row - top
+
+            if 0 <= i < count:
+                yield self._render_line(lines, i, h, w)
+            else:
+                yield blank
 
 
 __all__ = [
@@ -0,0 +1,39 @@
+import sys
+
+from screen.rendering.buffer import *
+from screen.rendering.buffer import __all__ as _buffer__all__
+from screen.rendering.differ import *
+from screen.rendering.differ import __all__ as _differ__all__
+from screen.rendering.scheduler import *
+from screen.rendering.scheduler import __all__ as _scheduler__all__
+
+
+# NOTE: the runner imports asyncio, which costs more than the rest of
+#       the library, so it is only imported when it is used.
+_runner__all__ = [
+    "open_writer",
+    "run",
+]
+
+
+def __getattr__(name):
+    if name in _runner__all__:
+        from screen.rendering import runner
+
+        return getattr(runner, name)
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+# NOTE: module __getattr__ requires Python 3.7, see PEP 562, so older
+#       versions import the runner with the package.
+if sys.version_info < (3, 7):
+    from screen.rendering.runner import *
+
+
+__all__ = [
+    *_buffer__all__,
+    *_differ__all__,
+    *_runner__all__,
+    *_scheduler__all__,
+]
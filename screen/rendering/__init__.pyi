@@ -0,0 +1,4 @@
+from screen.rendering.buffer import Buffer as Buffer, BufferView as BufferView
+from screen.rendering.differ import FrameDiffer as FrameDiffer, diff as diff, diff_buffers as diff_buffers
+from screen.rendering.runner import open_writer as open_writer, run as run
+from screen.rendering.scheduler import FrameStatistics as FrameStatistics, Scheduler as Scheduler
@@ -0,0 +1,417 @@
+import array
+
+from screen import utils
+
+
+_color_typecode = "I" if array.array("I").itemsize >= 4 else "L"
+
+
+def _style_bits(style):
+    bits = 0
+
+    for v in style.values:
+        if not 0 <= v < 64:
+            raise ValueError(f"style value {v} cannot be stored in a buffer")
+
+        bits |= 1 << v
+
+    return bits
+
+
+def _is_wide(c):
+    return c > 126 and utils.len(chr(c)) == 2
+
+
+def _unsplit(characters, i, start, stop, width):
+    # NOTE: the cells [start, stop) of the row at offset i were
+    #       overwritten, so half of a wide character can be left at
+    #       either edge; it is replaced by a space, otherwise the rest
+    #       of the row is drawn one column off.
+    if start >= stop:
+        return
+
+    if not characters[i + start]:
+        characters[i + start] = 32
+    if _is_wide(characters[i + stop - 1]):
+        characters[i + stop - 1] = 32
+
+    if start > 0 and _is_wide(characters[i + start - 1]):
+        characters[i + start - 1] = 32
+    if stop < width and not characters[i + stop]:
+        characters[i + stop] = 32
+
+
+class Buffer:
+    """
+    Represents a grid of cells.
+
+    Each cell attribute is stored in its own :class:`array.array`
+    plane, in row-major order. The second cell of a wide character has
+    a codepoint of ``0``, and a color value of ``0`` means the cell
+    uses the terminal's default color.
+
+    Parameters
+    ----------
+    height: :class:`int`
+        The number of rows.
+    width: :class:`int`
+        The number of columns.
+
+
+    .. container:: operations
+
+        .. describe:: x == y
+        .. describe:: x != y
+
+            Compares two :class:`~.Buffer` objects.
+
+    Attributes
+    ----------
+    height: :class:`int`
+        The number of rows.
+    width: :class:`int`
+        The number of columns.
+    characters: :class:`array.array`
+        The codepoint of each cell.
+    foregrounds: :class:`array.array`
+        The :attr:`~screen.drawing.Color.value` of the foreground of
+        each cell.
+    backgrounds: :class:`array.array`
+        The :attr:`~screen.drawing.Color.value` of the background of
+        each cell.
+    styles: :class:`array.array`
+        The :class:`~screen.drawing.Style` of each cell, as a bit set
+        of SGR values.
+    """
+
+    __slots__ = ("_planes", "backgrounds", "characters", "foregrounds", "height", "styles", "width")
+
+    def __init__(self, height, width):
+        size = height * width
+
+        self.height = height
+        self.width = width
+
+        self.characters = array.array("I", [32]) * size
+        self.foregrounds = array.array(_color_typecode, [0]) * size
+        self.backgrounds = array.array(_color_typecode, [0]) * size
+        self.styles = array.array("Q", [0]) * size
+
+        self._planes = (
+            memoryview(self.characters),
+            memoryview(self.foregrounds),
+            memoryview(self.backgrounds),
+            memoryview(self.styles),
+        )
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} height={self.height} width={self.width}>"
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+
+        return (
+            self.height == other.height
+            and self.width == other.width
+            and self.characters == other.characters
+            and self.foregrounds == other.foregrounds
+            and self.backgrounds == other.backgrounds
+            and self.styles == other.styles
+        )
+
+    def copy(self):
+        """
+        Copies the buffer.
+
+        Returns
+        -------
+        :class:`~.Buffer`
+            The copy.
+        """
+
+        buffer = self.__class__(0, 0)
+
+        buffer.height = self.height
+        buffer.width = self.width
+
+        buffer.characters = array.array("I", self.characters)
+        buffer.foregrounds = array.array(_color_typecode, self.foregrounds)
+        buffer.backgrounds = array.array(_color_typecode, self.backgrounds)
+        buffer.styles = array.array("Q", self.styles)
+
+        buffer._planes = (
+            memoryview(buffer.characters),
+            memoryview(buffer.foregrounds),
+            memoryview(buffer.backgrounds),
+            memoryview(buffer.styles),
+        )
+
+        return buffer
+
+    def lines(self):
+        """
+        Builds the text of each row, without colors and styles.
+
+        Returns
+        -------
+        List[:class:`str`]
+            The lines.
+        """
+
+        w = self.width
+        characters = self.characters
+
+        return [
+            "".join(chr(c) for c in characters[i : i + w] if c)
+            for i in range(0, self.height * w, w)
+        ]
+
+    def view(self, top=0, left=0, height=None, width=None):
+        """
+        Creates a view of a rectangle of the buffer.
+
+        Parameters
+        ----------
+        top: :class:`int`
+            The top row of the rectangle.
+        left: :class:`int`
+            The left column of the rectangle.
+        height: Optional[:class:`int`]
+            The height of the rectangle. Defaults to the remaining
+            height.
+        width: Optional[:class:`int`]
+            The width of the rectangle. Defaults to the remaining
+            width.
+
+        Returns
+        -------
+        :class:`~.BufferView`
+            The view.
+        """
+
+        return BufferView(self, 0, 0, self.height, self.width).view(top, left, height, width)
+
+
+class BufferView:
+    """
+    Represents a rectangle of a :class:`~.Buffer`.
+
+    Writing to a view writes directly to the planes of its buffer. A
+    view never writes outside of its rectangle, except to replace the
+    other half of a wide character it overwrites half of with a space.
+
+    Attributes
+    ----------
+    buffer: :class:`~.Buffer`
+        The buffer.
+    top: :class:`int`
+        The top row of the rectangle in the buffer.
+    left: :class:`int`
+        The left column of the rectangle in the buffer.
+    height: :class:`int`
+        The height of the rectangle.
+    width: :class:`int`
+        The width of the rectangle.
+    """
+
+    __slots__ = ("buffer", "height", "left", "top", "width")
+
+    def __init__(self, buffer, top, left, height, width):
+        self.buffer = buffer
+        self.height = height
+        self.left = left
+        self.top = top
+        self.width = width
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} top={self.top} left={self.left} "
+            f"height={self.height} width={self.width}>"
+        )
+
+    def _offset(self, row, column):
+        return (self.top + row) * self.buffer.width + self.left + column
+
+    def view(self, top=0, left=0, height=None, width=None):
+        """
+        Creates a view of a rectangle of this view. The rectangle is
+        clipped to this view.
+
+        Parameters
+        ----------
+        top: :class:`int`
+            The top row of the rectangle, relative to this view.
+        left: :class:`int`
+            The left column of the rectangle, relative to this view.
+        height: Optional[:class:`int`]
+            The height of the rectangle. Defaults to the remaining
+            height.
+        width: Optional[:class:`int`]
+            The width of the rectangle. Defaults to the remaining
+            width.
+
+        Returns
+        -------
+        :class:`~.BufferView`
+            The view.
+        """
+
+        top = min(max(top, 0), self.height)
+        left = min(max(left, 0), self.width)
+
+        height = self.height - top if height is None else min(max(height, 0), self.height - top)
+        width = self.width - left if width is None else min(max(width, 0), self.width - left)
+
+        return self.__class__(self.buffer, self.top + top, self.left + left, height, width)
+
+    def fill(self, character=" ", *, foreground=None, background=None, style=None):
+        """
+        Fills the view.
+
+        Parameters
+        ----------
+        character: :class:`str`
+            The character to fill the view with. Must be one column
+            wide.
+        foreground: Optional[:class:`~screen.drawing.Color`]
+            The foreground. ``None`` keeps the current foreground.
+        background: Optional[:class:`~screen.drawing.Color`]
+            The background. ``None`` keeps the current background.
+        style: Optional[:class:`~screen.drawing.Style`]
+            The style. ``None`` keeps the current style.
+        """
+
+        if not self.width:
+            return
+
+        characters, foregrounds, backgrounds, styles = self.buffer._planes
+
+        rows = [(characters, array.array("I", [ord(character)]))]
+
+        if foreground is not None:
+            rows.append((foregrounds, array.array(_color_typecode, [foreground.value])))
+        if background is not None:
+            rows.append((backgrounds, array.array(_color_typecode, [background.value])))
+        if style is not None:
+            rows.append((styles, array.array("Q", [_style_bits(style)])))
+
+        rows = [(plane, value * self.width) for (plane, value) in rows]
+
+        for row in range(self.height):
+            i = self._offset(row, 0)
+
+            for (plane, value) in rows:
+                plane[i : i + self.width] = value
+
+    def write(self, row, column, text, *, foreground=None, background=None, style=None):
+        """
+        Writes text to a row of the view. Text which does not fit in
+        the view is clipped, and zero-width characters are dropped.
+
+        .. note::
+
+            The text passed to this method should be
+            :func:`normalized <screen.utils.normalize>` and should not
+            contain escape sequences.
+
+        Parameters
+        ----------
+        row: :class:`int`
+            The row to write to.
+        column: :class:`int`
+            The column to start writing at.
+        text: :class:`str`
+            The text to write.
+        foreground: Optional[:class:`~screen.drawing.Color`]
+            The foreground. ``None`` keeps the current foreground.
+        background: Optional[:class:`~screen.drawing.Color`]
+            The background. ``None`` keeps the current background.
+        style: Optional[:class:`~screen.drawing.Style`]
+            The style. ``None`` keeps the current style.
+
+        Returns
+        -------
+        :class:`int`
+            The column after the last written cell.
+        """
+
+        if not 0 <= row < self.height:
+            return column
+
+        characters, foregrounds, backgrounds, styles = self.buffer._planes
+
+        start = column
+        i = self._offset(row, 0)
+
+        for c in text:
+            n = utils.len(c)
+
+            if n == 0:
+                continue
+
+            if column + n > self.width:
+                break
+
+            if column >= 0:
+                characters[i + column] = ord(c)
+
+                if n == 2:
+                    characters[i + column + 1] = 0
+
+            column += n
+
+        start = max(start, 0)
+        stop = max(column, 0)
+
+        _unsplit(characters, i - self.left, self.left + start, self.left + stop, self.buffer.width)
+
+        if foreground is not None:
+            foregrounds[i + start : i + stop] = array.array(
+                _color_typecode, [foreground.value]
+            ) * (stop - start)
+        if background is not None:
+            backgrounds[i + start : i + stop] = array.array(
+                _color_typecode, [background.value]
+            ) * (stop - start)
+        if style is not None:
+            styles[i + start : i + stop] = array.array("Q", [_style_bits(style)]) * (stop - start)
+
+        return column
+
+    def blit(self, source, top=0, left=0):
+        """
+        Copies the cells of another view into this view.
+
+        Parameters
+        ----------
+        source: :class:`~.BufferView`
+            The view to copy from.
+        top: :class:`int`
+            The row to copy to.
+        left: :class:`int`
+            The column to copy to.
+        """
+
+        target = self.view(top, left, source.height, source.width)
+
+        for row in range(target.height):
+            i = target._offset(row, 0)
+            j = source._offset(row, 0)
+
+            for (a, b) in zip(target.buffer._planes, source.buffer._planes):
+                a[i : i + target.width] = b[j : j + target.width]
+
+            _unsplit(
+                target.buffer._planes[0],
+                i - target.left,
+                target.left,
+                target.left + target.width,
+                target.buffer.width,
+            )
+
+
+__all__ = [
+    "Buffer",
+    "BufferView",
+]
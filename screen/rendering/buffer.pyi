@@ -0,0 +1,33 @@
+from typing import List, Optional
+
+import array
+
+from screen.drawing import Color, Style
+
+
+class Buffer:
+    height: int
+    width: int
+    characters: array.array[int]
+    foregrounds: array.array[int]
+    backgrounds: array.array[int]
+    styles: array.array[int]
+
+    def __init__(self, height: int, width: int) -> None: ...
+    def copy(self) -> Buffer: ...
+    def lines(self) -> List[str]: ...
+    def view(self, top: int=..., left: int=..., height: Optional[int]=..., width: Optional[int]=...) -> BufferView: ...
+
+
+class BufferView:
+    buffer: Buffer
+    top: int
+    left: int
+    height: int
+    width: int
+
+    def __init__(self, buffer: Buffer, top: int, left: int, height: int, width: int) -> None: ...
+    def view(self, top: int=..., left: int=..., height: Optional[int]=..., width: Optional[int]=...) -> BufferView: ...
+    def fill(self, character: str=..., *, foreground: Optional[Color]=..., background: Optional[Color]=..., style: Optional[Style]=...) -> None: ...
+    def write(self, row: int, column: int, text: str, *, foreground: Optional[Color]=..., background: Optional[Color]=..., style: Optional[Style]=...) -> int: ...
+    def blit(self, source: BufferView, top: int=..., left: int=...) -> None: ...
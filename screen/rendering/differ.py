@@ -0,0 +1,347 @@
+from screen import utils
+from screen.rendering.buffer import Buffer
+
+
+def _cells(line):
+    cells = list()
+    last = -1
+
+    for c in line:
+        n = utils.len(c)
+
+        if n == 0:
+            # NOTE: zero-width characters are drawn with the cell
+            #       before them.
+            if last >= 0:
+                cells[last] += c
+
+            continue
+
+        last = len(cells)
+        cells.append(c)
+
+        if n == 2:
+            cells.append("")
+
+    return cells
+
+
+def _move(row, column):
+    return f"\x1B[{row + 1};{column + 1}H"
+
+
+def diff(before, after, *, gap=8):
+    """
+    Calculates the terminal output required to update a frame.
+
+    Both frames are compared cell by cell; only the changed spans are
+    written, each preceded by a cursor move. Changed spans separated by
+    at most ``gap`` unchanged cells are written as a single span, since
+    rewriting a few cells is cheaper than moving the cursor.
+
+    .. note::
+
+        The lines passed to this function should be
+        :func:`normalized <screen.utils.normalize>` and should not
+        contain escape sequences.
+
+    Parameters
+    ----------
+    before: Sequence[:class:`str`]
+        The lines currently on the terminal.
+    after: Sequence[:class:`str`]
+        The lines to display.
+    gap: :class:`int`
+        The largest number of unchanged cells to rewrite in order to
+        join two changed spans.
+
+    Returns
+    -------
+    :class:`str`
+        The terminal output.
+
+    Examples
+    --------
+
+    .. code-block:: python3
+
+        >>> diff(["oranges", "apples"], ["oranges", "apricot"])
+        "\\x1B[2;3Hricot"
+    """
+
+    out = list()
+    cursor = None
+
+    for (row, line) in enumerate(after):
+        try:
+            previous = before[row]
+        except (IndexError) as e:
+            previous = ""
+
+        if line == previous:
+            continue
+
+        a = _cells(previous)
+        b = _cells(line)
+
+        width = min(len(a), len(b))
+
+        spans = list()
+        start = None
+
+        for column in range(width):
+            if a[column] == b[column]:
+                continue
+
+            if start is not None and column - stop <= gap:
+                stop = column + 1
+                continue
+
+            if start is not None:
+                spans.append((start, stop))
+
+            start, stop = column, column + 1
+
+        if len(b) > width:
+            if start is not None and width - stop <= gap:
+                stop = len(b)
+            else:
+                if start is not None:
+                    spans.append((start, stop))
+
+                start = width
+
+            stop = len(b)
+
+        if start is not None:
+            spans.append((start, stop))
+
+        for (start, stop) in spans:
+            # NOTE: never start or end a span halfway through a wide
+            #       character.
+            if b[start] == "":
+                start -= 1
+
+            if stop < len(b) and b[stop] == "":
+                stop += 1
+
+            if cursor != (row, start):
+                out.append(_move(row, start))
+
+            out.append("".join(b[start:stop]))
+            cursor = (row, stop)
+
+        if len(a) > len(b):
+            if cursor != (row, len(b)):
+                out.append(_move(row, len(b)))
+
+            out.append("\x1B[K")
+            cursor = (row, len(b))
+
+    if len(before) > len(after):
+        out.append(_move(len(after), 0))
+        out.append("\x1B[J")
+
+    return "".join(out)
+
+
+def _rgb(value):
+    return f"{value >> 16 & 0xFF};{value >> 8 & 0xFF};{value & 0xFF}"
+
+
+def _sgr(foreground, background, style):
+    values = ["0"]
+    values.extend(str(v) for v in range(64) if style >> v & 1)
+
+    # NOTE: fully transparent colors, which include the unset colors
+    #       of a buffer, are left to the default of the terminal.
+    if foreground >> 24 & 0xFF:
+        values.append(f"38;2;{_rgb(foreground)}")
+    if background >> 24 & 0xFF:
+        values.append(f"48;2;{_rgb(background)}")
+
+    return f"\x1B[{';'.join(values)}m"
+
+
+def diff_buffers(before, after, *, gap=8):
+    """
+    Calculates the terminal output required to update a frame.
+
+    This function is identical to :func:`~.diff`, except that it
+    compares :class:`~.Buffer` objects and writes colors and styles.
+    Colors with an alpha of ``0``, such as
+    :attr:`Color.transparent <screen.drawing.Color.transparent>`, are
+    written as the default color of the terminal.
+    When ``before`` is ``None`` or differently sized, the whole of
+    ``after`` is written.
+
+    Parameters
+    ----------
+    before: Optional[:class:`~.Buffer`]
+        The buffer currently on the terminal.
+    after: :class:`~.Buffer`
+        The buffer to display.
+    gap: :class:`int`
+        The largest number of unchanged cells to rewrite in order to
+        join two changed spans.
+
+    Returns
+    -------
+    :class:`str`
+        The terminal output.
+    """
+
+    if before is not None and (before.height, before.width) != (after.height, after.width):
+        before = None
+
+    out = list()
+    cursor = None
+    attributes = None
+
+    w = after.width
+    b_planes = after._planes
+    b_characters, b_foregrounds, b_backgrounds, b_styles = b_planes
+
+    for row in range(after.height):
+        i = row * w
+
+        if before is None:
+            spans = [(0, w)] if w else []
+        else:
+            if all(a[i : i + w] == b[i : i + w] for (a, b) in zip(before._planes, b_planes)):
+                continue
+
+            changed = [
+                column
+                for column in range(w)
+                if any(a[i + column] != b[i + column] for (a, b) in zip(before._planes, b_planes))
+            ]
+
+            spans = list()
+            start = stop = changed[0]
+
+            for column in changed:
+                if column - stop > gap:
+                    spans.append((start, stop))
+                    start = column
+
+                stop = column + 1
+
+            spans.append((start, stop))
+
+        for (start, stop) in spans:
+            if not b_characters[i + start] and start:
+                start -= 1
+
+            if stop < w and not b_characters[i + stop]:
+                stop += 1
+
+            if cursor != (row, start):
+                out.append(_move(row, start))
+
+            for j in range(i + start, i + stop):
+                c = b_characters[j]
+
+                if not c:
+                    continue
+
+                cell = (b_foregrounds[j], b_backgrounds[j], b_styles[j])
+                if cell != attributes:
+                    out.append(_sgr(*cell))
+                    attributes = cell
+
+                out.append(chr(c))
+
+            cursor = (row, stop)
+
+    if attributes is not None:
+        out.append("\x1B[0m")
+
+    return "".join(out)
+
+
+class FrameDiffer:
+    """
+    Represents a stateful frame differ.
+
+    The differ remembers the last frame it produced output for, and
+    only emits the changes between it and the next frame. Frames can
+    be either lines or :class:`~.Buffer` objects.
+
+    Parameters
+    ----------
+    gap: :class:`int`
+        The largest number of unchanged cells to rewrite in order to
+        join two changed spans. See :func:`~.diff`.
+
+
+    Attributes
+    ----------
+    gap: :class:`int`
+        The largest number of unchanged cells to rewrite in order to
+        join two changed spans.
+    """
+
+    __slots__ = ("_frame", "gap")
+
+    def __init__(self, *, gap=8):
+        self._frame = None
+
+        self.gap = gap
+
+    def reset(self):
+        """
+        Forgets the last frame, so that the next call to
+        :meth:`~.update` clears the terminal and redraws the whole
+        frame.
+        """
+
+        self._frame = None
+
+    def update(self, lines):
+        """
+        Calculates the terminal output required to display a frame.
+
+        Parameters
+        ----------
+        lines: Union[Iterable[:class:`str`], :class:`~.Buffer`]
+            The lines of the frame, for example the result of
+            :meth:`Control.render() <screen.controls.Control.render>`,
+            or a buffer, for example one drawn by
+            :meth:`Control.render_into() \
+            <screen.controls.Control.render_into>`.
+
+        Returns
+        -------
+        :class:`str`
+            The terminal output.
+        """
+
+        if isinstance(lines, Buffer):
+            before = self._frame if isinstance(self._frame, Buffer) else None
+            out = diff_buffers(before, lines, gap=self.gap)
+
+            if before is None:
+                out = "\x1B[H\x1B[2J" + out
+
+            self._frame = lines.copy()
+
+            return out
+
+        lines = tuple(lines)
+
+        if self._frame is None or isinstance(self._frame, Buffer):
+            out = "\x1B[H\x1B[2J" + diff((), lines, gap=self.gap)
+        else:
+            out = diff(self._frame, lines, gap=self.gap)
+
+        self._frame = lines
+
+        return out
+
+
+__all__ = [
+    "diff",
+    "diff_buffers",
+    "FrameDiffer",
+]
@@ -0,0 +1,15 @@
+from typing import Iterable, Optional, Sequence, Union
+
+from screen.rendering.buffer import Buffer
+
+
+def diff(before: Sequence[str], after: Sequence[str], *, gap: int=...) -> str: ...
+def diff_buffers(before: Optional[Buffer], after: Buffer, *, gap: int=...) -> str: ...
+
+
+class FrameDiffer:
+    gap: int
+
+    def __init__(self, *, gap: int=...) -> None: ...
+    def reset(self) -> None: ...
+    def update(self, lines: Union[Iterable[str], Buffer]) -> str: ...
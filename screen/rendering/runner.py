@@ -0,0 +1,110 @@
+import asyncio
+import asyncio.streams
+
+from screen.rendering.differ import FrameDiffer
+from screen.rendering.scheduler import Scheduler
+
+
+async def open_writer(pipe):
+    """
+    Opens a :class:`asyncio.StreamWriter` for a pipe-like file, for
+    example :data:`sys.stdout`, the write end of :func:`os.pipe`, or a
+    pseudo-terminal from :func:`os.openpty`.
+
+    This function is a coroutine.
+
+    Parameters
+    ----------
+    pipe: file object
+        The file to write to.
+
+    Returns
+    -------
+    :class:`asyncio.StreamWriter`
+        The writer.
+    """
+
+    loop = asyncio.get_event_loop()
+
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, pipe)
+    return asyncio.StreamWriter(transport, protocol, None, loop)
+
+
+async def run(control, writer, h, w, *, fps=60, stop=None, encoding="utf-8"):
+    """
+    Renders a control to a writer until stopped.
+
+    Frames are scheduled by a :class:`~.Scheduler` and written as the
+    minimal update calculated by a :class:`~.FrameDiffer`. After each
+    frame, the runner waits for the writer to
+    :meth:`drain <asyncio.StreamWriter.drain>`; modifications made in
+    the meantime are coalesced, so a slow writer receives fewer frames
+    instead of a growing backlog, and the event loop is never blocked
+    on output.
+
+    This function is a coroutine.
+
+    Parameters
+    ----------
+    control: :class:`~screen.controls.Control`
+        The root control.
+    writer: :class:`asyncio.StreamWriter`
+        The writer. Any object with a ``write`` method and a ``drain``
+        coroutine method can be used.
+    h: :class:`int`
+        The height to render the control at.
+    w: :class:`int`
+        The width to render the control at.
+    fps: :class:`float`
+        The target number of frames per second.
+    stop: Optional[:class:`asyncio.Event`]
+        The event which stops the runner when set. ``None`` means the
+        runner runs until cancelled. A stopped runner writes a last
+        frame if the control was modified since the previous frame.
+    encoding: :class:`str`
+        The encoding used to write to the writer.
+
+    Returns
+    -------
+    :class:`~.FrameStatistics`
+        The frame-time statistics.
+    """
+
+    loop = asyncio.get_event_loop()
+
+    differ = FrameDiffer()
+    frames = list()
+
+    scheduler = Scheduler(control, h, w, frames.append, fps=fps, clock=loop.time)
+
+    while stop is None or not stop.is_set():
+        if scheduler.tick():
+            writer.write(differ.update(frames.pop()).encode(encoding))
+            await writer.drain()
+
+        delay = scheduler.delay() or 1 / scheduler.fps
+
+        if stop is None:
+            await asyncio.sleep(delay)
+        else:
+            try:
+                await asyncio.wait_for(stop.wait(), delay)
+            except (asyncio.TimeoutError) as e:
+                pass
+
+    # NOTE: modifications made since the last frame are still written
+    #       when the runner is stopped, as soon as the next frame is due.
+    if scheduler.pending:
+        await asyncio.sleep(scheduler.delay())
+
+        if scheduler.tick():
+            writer.write(differ.update(frames.pop()).encode(encoding))
+            await writer.drain()
+
+    return scheduler.statistics
+
+
+__all__ = [
+    "open_writer",
+    "run",
+]
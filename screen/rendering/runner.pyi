@@ -0,0 +1,19 @@
+from typing import IO, Any, Optional
+
+import asyncio
+
+from screen.controls import Control
+from screen.rendering.scheduler import FrameStatistics
+
+
+async def open_writer(pipe: IO[Any]) -> asyncio.StreamWriter: ...
+async def run(
+    control: Control,
+    writer: asyncio.StreamWriter,
+    h: int,
+    w: int,
+    *,
+    fps: float=...,
+    stop: Optional[asyncio.Event]=...,
+    encoding: str=...,
+) -> FrameStatistics: ...
@@ -0,0 +1,264 @@
+import time
+
+
+class FrameStatistics:
+    """
+    Represents the frame-time statistics of a :class:`~.Scheduler`.
+
+    Attributes
+    ----------
+    frames: :class:`int`
+        The number of frames rendered.
+    late: :class:`int`
+        The number of frames which took longer than the frame interval.
+    idle: :class:`int`
+        The number of ticks which had nothing to render.
+    last_time: :class:`float`
+        The duration of the last frame, in seconds.
+    max_time: :class:`float`
+        The duration of the longest frame, in seconds.
+    min_time: :class:`float`
+        The duration of the shortest frame, in seconds.
+    total_time: :class:`float`
+        The total duration of all frames, in seconds.
+    """
+
+    __slots__ = ("frames", "idle", "last_time", "late", "max_time", "min_time", "total_time")
+
+    def __init__(self):
+        self.reset()
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} frames={self.frames} late={self.late} "
+            f"mean_time={self.mean_time:.6f}>"
+        )
+
+    @property
+    def mean_time(self):
+        """
+        The mean duration of a frame, in seconds.
+
+        :type: :class:`float`
+        """
+
+        return self.total_time / self.frames if self.frames else 0.0
+
+    def reset(self):
+        """
+        Resets the statistics.
+        """
+
+        self.frames = 0
+        self.idle = 0
+        self.last_time = 0.0
+        self.late = 0
+        self.max_time = 0.0
+        self.min_time = 0.0
+        self.total_time = 0.0
+
+    def _record(self, duration, interval):
+        if not self.frames or duration < self.min_time:
+            self.min_time = duration
+
+        if duration > self.max_time:
+            self.max_time = duration
+
+        if duration > interval:
+            self.late += 1
+
+        self.frames += 1
+        self.last_time = duration
+        self.total_time += duration
+
+
+class Scheduler:
+    """
+    Represents a frame scheduler.
+
+    Property setters mark the modified control and its ancestors as
+    :attr:`dirty <screen.controls.Control.is_dirty>`, so the scheduler
+    only has to check the root control. Any number of modifications
+    between two ticks are coalesced into a single render of the latest
+    state, and at most one frame is rendered per frame interval.
+
+    Parameters
+    ----------
+    control: :class:`~screen.controls.Control`
+        The root control.
+    h: :class:`int`
+        The height to render the control at.
+    w: :class:`int`
+        The width to render the control at.
+    callback: Callable[[Tuple[:class:`str`, ...]], Any]
+        The function called with the lines of each frame.
+    fps: :class:`float`
+        The target number of frames per second.
+    clock: Callable[[], :class:`float`]
+        The monotonic clock used to schedule frames. Defaults to
+        :func:`time.perf_counter`.
+
+
+    Attributes
+    ----------
+    control: :class:`~screen.controls.Control`
+        The root control.
+    h: :class:`int`
+        The height to render the control at.
+    w: :class:`int`
+        The width to render the control at.
+    callback: Callable[[Tuple[:class:`str`, ...]], Any]
+        The function called with the lines of each frame.
+    statistics: :class:`~.FrameStatistics`
+        The frame-time statistics.
+    """
+
+    __slots__ = (
+        "_clock",
+        "_deadline",
+        "_interval",
+        "_requested",
+        "callback",
+        "control",
+        "h",
+        "statistics",
+        "w",
+    )
+
+    def __init__(self, control, h, w, callback, *, fps=60, clock=time.perf_counter):
+        self._clock = clock
+        self._deadline = None
+        self._requested = True
+
+        self.callback = callback
+        self.control = control
+        self.fps = fps
+        self.h = h
+        self.statistics = FrameStatistics()
+        self.w = w
+
+    @property
+    def fps(self):
+        """
+        The target number of frames per second.
+
+        :type: :class:`float`
+        """
+
+        return 1 / self._interval
+
+    @fps.setter
+    def fps(self, value):
+        if value <= 0:
+            raise ValueError("fps must be positive")
+
+        self._interval = 1 / value
+
+    @property
+    def pending(self):
+        """
+        Whether the next tick will render a frame, provided it is due.
+
+        :type: :class:`bool`
+        """
+
+        return self._requested or self.control.is_dirty
+
+    def request(self):
+        """
+        Requests a frame even if no control is dirty, for example
+        after the terminal was cleared.
+        """
+
+        self._requested = True
+
+    def resize(self, h, w):
+        """
+        Changes the size to render the control at, and requests a
+        frame.
+
+        Parameters
+        ----------
+        h: :class:`int`
+            The height.
+        w: :class:`int`
+            The width.
+        """
+
+        if (h, w) != (self.h, self.w):
+            self.h = h
+            self.w = w
+            self._requested = True
+
+    def delay(self):
+        """
+        Calculates the time until the next frame is due.
+
+        Returns
+        -------
+        :class:`float`
+            The delay, in seconds. ``0`` when a frame is due.
+        """
+
+        if self._deadline is None:
+            return 0.0
+
+        return max(self._deadline - self._clock(), 0.0)
+
+    def tick(self):
+        """
+        Renders a frame if one is due and the root control is dirty or
+        a frame was requested.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether a frame was rendered.
+        """
+
+        now = self._clock()
+
+        if self._deadline is not None and now < self._deadline:
+            return False
+
+        if not self.pending:
+            self.statistics.idle += 1
+            return False
+
+        self._requested = False
+
+        lines = tuple(self.control.render(self.h, self.w))
+        self.callback(lines)
+
+        end = self._clock()
+        self.statistics._record(end - now, self._interval)
+
+        # NOTE: the next deadline is based on the start of this frame,
+        #       but never in the past, so a slow frame does not cause a
+        #       burst of catch-up frames.
+        self._deadline = max(now + self._interval, end)
+
+        return True
+
+    def run(self, *, until=None, sleep=time.sleep):
+        """
+        Runs the scheduler, sleeping between frames.
+
+        Parameters
+        ----------
+        until: Optional[Callable[[], :class:`bool`]]
+            A function returning whether to stop. ``None`` means the
+            scheduler runs forever.
+        sleep: Callable[[:class:`float`], Any]
+            The function used to sleep. Defaults to :func:`time.sleep`.
+        """
+
+        while until is None or not until():
+            self.tick()
+            sleep(self.delay() or self._interval)
+
+
+__all__ = [
+    "FrameStatistics",
+    "Scheduler",
+]
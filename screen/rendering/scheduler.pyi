@@ -0,0 +1,52 @@
+from typing import Any, Callable, Optional, Tuple
+
+from screen.controls import Control
+
+
+class FrameStatistics:
+    frames: int
+    idle: int
+    last_time: float
+    late: int
+    max_time: float
+    min_time: float
+    total_time: float
+
+    def __init__(self) -> None: ...
+
+    @property
+    def mean_time(self) -> float: ...
+
+    def reset(self) -> None: ...
+
+
+class Scheduler:
+    callback: Callable[[Tuple[str, ...]], Any]
+    control: Control
+    h: int
+    statistics: FrameStatistics
+    w: int
+
+    def __init__(
+        self,
+        control: Control,
+        h: int,
+        w: int,
+        callback: Callable[[Tuple[str, ...]], Any],
+        *,
+        fps: float=...,
+        clock: Callable[[], float]=...,
+    ) -> None: ...
+
+    @property
+    def fps(self) -> float: ...
+    @fps.setter
+    def fps(self, value: float) -> None: ...
+    @property
+    def pending(self) -> bool: ...
+
+    def request(self) -> None: ...
+    def resize(self, h: int, w: int) -> None: ...
+    def delay(self) -> float: ...
+    def tick(self) -> bool: ...
+    def run(self, *, until: Optional[Callable[[], bool]]=..., sleep: Callable[[float], Any]=...) -> None: ...
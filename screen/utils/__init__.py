@@ -1,3 +1,5 @@
+from screen.utils.cache import *
+from screen.utils.cache import __all__ as _cache__all__
 from screen.utils.math import *
 from screen.utils.math import __all__ as _math__all__
 from screen.utils.text import *
@@ -5,6 +7,7 @@ from screen.utils.text import __all__ as _text__all__
 
 
 __all__ = [
+    *_cache__all__,
     *_math__all__,
     *_text__all__,
 ]
@@ -1,2 +1,3 @@
+from screen.utils.cache import CacheBudget as CacheBudget, CachePolicy as CachePolicy, LRUCache as LRUCache, default_budget as default_budget
 from screen.utils.math import distance as distance, interpolate as interpolate
-from screen.utils.text import decimal_to_latin as decimal_to_latin, decimal_to_roman as decimal_to_roman, len as len, normalize as normalize
+from screen.utils.text import WidthIndex as WidthIndex, decimal_to_latin as decimal_to_latin, decimal_to_roman as decimal_to_roman, len as len, normalize as normalize
@@ -0,0 +1,286 @@
+import collections
+import functools
+import sys
+import threading
+import weakref
+
+
+def _sizeof(value):
+    size = sys.getsizeof(value)
+
+    if isinstance(value, (list, tuple)):
+        size += sum(sys.getsizeof(v) for v in value)
+
+    return size
+
+
+class CacheBudget:
+    """
+    Represents a memory budget shared by a group of
+    :class:`~.LRUCache` objects.
+
+    When the total estimated size of the entries in the group exceeds
+    the budget, entries are evicted from the least recently used
+    caches until the group fits again.
+
+    Parameters
+    ----------
+    max_bytes: :class:`int`
+        The maximum estimated size of the entries, in bytes.
+
+    Attributes
+    ----------
+    max_bytes: :class:`int`
+        The maximum estimated size of the entries, in bytes.
+    nbytes: :class:`int`
+        The current estimated size of the entries, in bytes.
+    """
+
+    __slots__ = ("_caches", "_collected", "_lock", "_sizes", "max_bytes", "nbytes")
+
+    def __init__(self, max_bytes):
+        self._caches = collections.OrderedDict()
+        self._collected = list()
+        self._lock = threading.Lock()
+        self._sizes = dict()
+
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} nbytes={self.nbytes} max_bytes={self.max_bytes}>"
+
+    def _charge(self, cache, n):
+        # NOTE: the lock of the budget is always acquired before the
+        #       lock of a cache, and caches release their lock before
+        #       charging the budget.
+        with self._lock:
+            while self._collected:
+                key, ref = self._collected.pop()
+
+                if self._caches.get(key) is ref:
+                    self._forget(key)
+
+            key = id(cache)
+
+            try:
+                self._caches.move_to_end(key)
+            except (KeyError) as e:
+                self._caches[key] = weakref.ref(cache, functools.partial(self._collect, key))
+                self._sizes[key] = 0
+
+            self._sizes[key] += n
+            self.nbytes += n
+
+            while self.nbytes > self.max_bytes and self._caches:
+                key, ref = next(iter(self._caches.items()))
+                cache = ref()
+
+                if cache is None:
+                    self._forget(key)
+                    continue
+
+                with cache._lock:
+                    n = cache._evict() if cache._data else None
+
+                if n is None:
+                    self._forget(key)
+                    continue
+
+                self._sizes[key] -= n
+                self.nbytes -= n
+
+    def _collect(self, key, ref):
+        # NOTE: a cache can be collected while any lock is held, so
+        #       collected caches are only forgotten by the next charge.
+        self._collected.append((key, ref))
+
+    def _forget(self, key):
+        self._caches.pop(key, None)
+        self.nbytes -= self._sizes.pop(key, 0)
+
+
+class LRUCache:
+    """
+    Represents a least recently used cache.
+
+    A cache can be shared by several threads. Lookups do not take a
+    lock, while insertions and evictions are serialized.
+
+    Parameters
+    ----------
+    maxsize: Optional[:class:`int`]
+        The maximum number of entries. ``None`` means the cache is only
+        bounded by ``budget``.
+    budget: Optional[:class:`~.CacheBudget`]
+        The memory budget to charge the entries to.
+
+    Attributes
+    ----------
+    maxsize: Optional[:class:`int`]
+        The maximum number of entries.
+    nbytes: :class:`int`
+        The estimated size of the entries, in bytes. This is always
+        ``0`` when the cache has no budget.
+    """
+
+    __slots__ = ("__weakref__", "_budget", "_data", "_lock", "maxsize", "nbytes")
+
+    def __init__(self, maxsize=None, *, budget=None):
+        self._budget = budget
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        self.maxsize = maxsize
+        self.nbytes = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} len={len(self._data)} maxsize={self.maxsize}>"
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        # NOTE: lookups do not take the lock. An entry which another
+        #       thread evicts in the meantime is returned, but not
+        #       moved.
+        value, _ = self._data[key]
+
+        try:
+            self._data.move_to_end(key)
+        except (KeyError) as e:
+            pass
+
+        return value
+
+    def __setitem__(self, key, value):
+        size = _sizeof(value) if self._budget is not None else 0
+
+        with self._lock:
+            try:
+                _, before = self._data.pop(key)
+            except (KeyError) as e:
+                before = 0
+
+            self._data[key] = (value, size)
+
+            n = size - before
+            self.nbytes += n
+
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    n -= self._evict()
+
+        if self._budget is not None:
+            self._budget._charge(self, n)
+
+    def _evict(self):
+        _, (_, size) = self._data.popitem(last=False)
+        self.nbytes -= size
+        return size
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+
+        if not self._data:
+            return
+
+        with self._lock:
+            self._data.clear()
+            n, self.nbytes = self.nbytes, 0
+
+        if self._budget is not None and n:
+            self._budget._charge(self, -n)
+
+
+class _EmptyCache:
+    # NOTE: controls share this cache until their first insertion, so
+    #       controls which are never measured or rendered do not
+    #       allocate caches.
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>"
+
+    def __len__(self):
+        return 0
+
+    def __contains__(self, key):
+        return False
+
+    def __getitem__(self, key):
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        raise TypeError("the empty cache cannot be modified")
+
+    def clear(self):
+        pass
+
+
+_empty_cache = _EmptyCache()
+
+
+class CachePolicy:
+    """
+    Represents the policy used to create the caches of a
+    :class:`~screen.controls.Control`.
+
+    Parameters
+    ----------
+    maxsize: Optional[:class:`int`]
+        The maximum number of entries per cache. ``None`` means the
+        caches are only bounded by ``budget``.
+    budget: Optional[:class:`~.CacheBudget`]
+        The memory budget shared by the caches.
+
+    Attributes
+    ----------
+    maxsize: Optional[:class:`int`]
+        The maximum number of entries per cache.
+    budget: Optional[:class:`~.CacheBudget`]
+        The memory budget shared by the caches.
+    """
+
+    __slots__ = ("budget", "maxsize")
+
+    def __init__(self, maxsize=None, *, budget=None):
+        self.budget = budget
+        self.maxsize = maxsize
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} maxsize={self.maxsize} budget={self.budget!r}>"
+
+    def create(self):
+        """
+        Creates a cache.
+
+        When the policy has neither a ``maxsize`` nor a ``budget``,
+        this method returns a :class:`dict`.
+
+        Returns
+        -------
+        Union[:class:`~.LRUCache`, :class:`dict`]
+            The cache.
+        """
+
+        if self.maxsize is None and self.budget is None:
+            return dict()
+
+        return LRUCache(self.maxsize, budget=self.budget)
+
+
+default_budget = CacheBudget(32 * 1024 * 1024)
+
+
+__all__ = [
+    "CacheBudget",
+    "CachePolicy",
+    "LRUCache",
+    "default_budget",
+]
@@ -0,0 +1,31 @@
+from typing import Any, Dict, Hashable, Optional, Union
+
+
+class CacheBudget:
+    max_bytes: int
+    nbytes: int
+
+    def __init__(self, max_bytes: int) -> None: ...
+
+
+class LRUCache:
+    maxsize: Optional[int]
+    nbytes: int
+
+    def __init__(self, maxsize: Optional[int]=..., *, budget: Optional[CacheBudget]=...) -> None: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, key: Hashable) -> bool: ...
+    def __getitem__(self, key: Hashable) -> Any: ...
+    def __setitem__(self, key: Hashable, value: Any) -> None: ...
+    def clear(self) -> None: ...
+
+
+class CachePolicy:
+    budget: Optional[CacheBudget]
+    maxsize: Optional[int]
+
+    def __init__(self, maxsize: Optional[int]=..., *, budget: Optional[CacheBudget]=...) -> None: ...
+    def create(self) -> Union[LRUCache, Dict[Any, Any]]: ...
+
+
+default_budget: CacheBudget
@@ -9,7 +9,9 @@ from typing import (
     Union,
 )
 
+import array
 import collections
+import itertools
 import sys
 
 
@@ -48,12 +50,16 @@ except (ImportError) as e:
 builtins_isinstance = isinstance
 
 
-def get_type_doc(t, *, optional=True):
-    if isinstance(t, (types_GenericAlias, typing_GenericAlias)) or (
+def _is_generic(t):
+    return builtins_isinstance(t, (types_GenericAlias, typing_GenericAlias)) or (
         PY36
         and hasattr(t, "__origin__")
         and t.__origin__ in (Dict, FrozenSet, List, Set, Tuple, Union)
-    ):
+    )
+
+
+def get_type_doc(t, *, optional=True):
+    if _is_generic(t):
         origin = t.__origin__
 
         if origin is Union and type(None) in t.__args__:
@@ -68,7 +74,7 @@ def get_type_doc(t, *, optional=True):
 
         if PY36:
             name = repr(t).rsplit(".")[1].split("[")[0]
-        elif isinstance(origin, SpecialForm):
+        elif builtins_isinstance(origin, SpecialForm):
             name = origin._name
         else:
             name = origin.__name__.capitalize()
@@ -88,7 +94,7 @@ def get_type_doc(t, *, optional=True):
             except (IndexError) as e:
                 pass
 
-        if isinstance(t, SpecialForm):
+        if builtins_isinstance(t, SpecialForm):
             return t._name
         else:
             return t.__name__
@@ -98,7 +104,7 @@ def isinstance(obj, t):
     if builtins_isinstance(t, tuple):
         return any(isinstance(obj, t) for t in t)
 
-    if builtins_isinstance(t, (types_GenericAlias, typing_GenericAlias)):
+    if _is_generic(t):
         if t.__origin__ in (Dict, dict):
             k_T, v_T = t.__args__
 
@@ -145,6 +151,236 @@ def isinstance(obj, t):
     return builtins_isinstance(obj, t)
 
 
+def _accept(obj):
+    return True
+
+
+def _sample(obj, sample):
+    if sample is None or len(obj) <= sample:
+        return obj
+
+    # NOTE: the sample is spread across the whole collection, and
+    #       includes both ends of a sequence, so that an element which
+    #       was prepended or appended is always checked.
+    step = -(-len(obj) // sample)
+
+    if builtins_isinstance(obj, (list, tuple)):
+        return itertools.chain(obj[::step], obj[-1:])
+
+    return itertools.islice(obj, 0, None, step)
+
+
+def _compile_validator(t, sample):
+    if builtins_isinstance(t, tuple):
+        if all(builtins_isinstance(a, type) for a in t):
+            return lambda obj: builtins_isinstance(obj, t)
+
+        validators = tuple(get_validator(a, sample=sample) for a in t)
+        return lambda obj: any(v(obj) for v in validators)
+
+    if _is_generic(t):
+        origin = t.__origin__
+
+        if origin in (Dict, dict):
+            k_v, v_v = (get_validator(a, sample=sample) for a in t.__args__)
+
+            def validate(obj):
+                return builtins_isinstance(obj, dict) and all(
+                    k_v(k) and v_v(obj[k]) for k in _sample(obj, sample)
+                )
+
+            return validate
+        elif origin in (FrozenSet, frozenset, List, list, Set, set):
+            if origin in (FrozenSet, frozenset):
+                container = frozenset
+            elif origin in (List, list):
+                container = list
+            else:
+                container = set
+
+            e_v = get_validator(t.__args__[0], sample=sample)
+
+            if e_v is _accept:
+                return lambda obj: builtins_isinstance(obj, container)
+
+            return lambda obj: builtins_isinstance(obj, container) and all(
+                map(e_v, _sample(obj, sample))
+            )
+        elif origin is Literal:
+            args = t.__args__
+            return lambda obj: obj in args
+        elif t is tuple or origin in (Tuple, tuple):
+            args = getattr(t, "__args__", None) or (Any, Ellipsis)
+
+            if args[-1] is Ellipsis:
+                e_v = get_validator(args[:-1], sample=sample)
+
+                return lambda obj: builtins_isinstance(obj, tuple) and all(
+                    map(e_v, _sample(obj, sample))
+                )
+
+            validators = tuple(get_validator(a, sample=sample) for a in args)
+
+            return (
+                lambda obj: builtins_isinstance(obj, tuple)
+                and len(obj) == len(validators)
+                and all(v(e) for (v, e) in zip(validators, obj))
+            )
+        elif origin is Union:
+            return get_validator(t.__args__, sample=sample)
+
+    if t is Any or builtins_isinstance(t, SpecialForm) and t._name == "Any":
+        return _accept
+
+    return lambda obj: builtins_isinstance(obj, t)
+
+
+_validators = dict()
+
+
+def get_validator(t, *, sample=None):
+    """
+    Compiles a function checking whether an object is an instance of a
+    type. This function supports the same types as
+    :func:`~.isinstance`, and caches the compiled function per type.
+
+    When ``sample`` is given, at most ``sample`` elements of each
+    collection are checked.
+    """
+
+    key = (t, sample)
+
+    try:
+        return _validators[key]
+    except (KeyError) as e:
+        pass
+    except (TypeError) as e:
+        return _compile_validator(t, sample)
+
+    validator = _validators[key] = _compile_validator(t, sample)
+    return validator
+
+
+class FenwickTree:
+    """
+    A binary indexed tree over non-negative integers, supporting point
+    updates, prefix sums, and prefix searches in O(log n).
+    """
+
+    __slots__ = ("_tree", "_values")
+
+    def __init__(self, values):
+        self._build(array.array("q", values))
+
+    def _build(self, values):
+        tree = array.array("q", [0]) * (len(values) + 1)
+
+        for (i, v) in enumerate(values, 1):
+            tree[i] += v
+
+            j = i + (i & -i)
+            if j < len(tree):
+                tree[j] += tree[i]
+
+        self._tree = tree
+        self._values = values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getitem__(self, i):
+        return self._values[i]
+
+    def __setitem__(self, i, value):
+        delta = value - self._values[i]
+
+        if not delta:
+            return
+
+        self._values[i] = value
+
+        tree = self._tree
+        i += 1
+        while i < len(tree):
+            tree[i] += delta
+            i += i & -i
+
+    def append(self, value):
+        """
+        Appends a value in O(log n).
+        """
+
+        # NOTE: the new node covers the values since the node of its
+        #       lowest set bit, all of which are already in the tree.
+        i = len(self._values) + 1
+        self._tree.append(value + self.prefix(i - 1) - self.prefix(i - (i & -i)))
+        self._values.append(value)
+
+    def splice(self, i, removed, values):
+        """
+        Replaces ``removed`` values from index ``i`` with ``values``.
+        Splicing at the end costs O(log n) per value, otherwise the
+        tree is rebuilt in O(n).
+        """
+
+        if i + removed == len(self._values):
+            # NOTE: a node only covers values up to its own index, so
+            #       truncating the tree keeps the remaining nodes valid.
+            del self._values[i:]
+            del self._tree[i + 1 :]
+
+            for v in values:
+                self.append(v)
+        else:
+            self._values[i : i + removed] = array.array("q", values)
+            self._build(self._values)
+
+    def prefix(self, i):
+        """
+        Returns the sum of the first ``i`` values.
+        """
+
+        tree = self._tree
+        total = 0
+
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+
+        return total
+
+    def total(self):
+        """
+        Returns the sum of all values.
+        """
+
+        return self.prefix(len(self._values))
+
+    def search(self, offset):
+        """
+        Returns the index of the value containing ``offset``, that is
+        the largest ``i`` such that ``prefix(i) <= offset``, clamped to
+        the last index.
+        """
+
+        tree = self._tree
+        n = len(self._values)
+
+        i = 0
+        step = 1 << n.bit_length()
+
+        while step:
+            j = i + step
+
+            if j <= n and tree[j] <= offset:
+                i = j
+                offset -= tree[j]
+
+            step >>= 1
+
+        return min(i, n - 1)
+
+
 factory_ignore_types = (classmethod, property, staticmethod, FunctionType)
 
 
@@ -156,7 +392,7 @@ class AttributeFactoryMeta(type):
         cls = super().__new__(cls_meta, cls_name, cls_bases, cls_attrs)
 
         for (attr_name, attr_value) in cls_attrs.items():
-            if attr_name.startswith("_") or isinstance(attr_value, factory_ignore_types):
+            if attr_name.startswith("_") or builtins_isinstance(attr_value, factory_ignore_types):
                 continue
 
             setattr(cls, attr_name, attr_init(cls, attr_value))
@@ -170,17 +406,21 @@ class AttributeFactoryMeta(type):
         return cls
 
 
+# NOTE: the member types of all enums derive from a single named
+#       tuple, which is much cheaper than creating a named tuple per
+#       enum.
+_EnumMember = collections.namedtuple("_EnumMember", ["name", "value"])
+
+
 class EnumMeta(type):
     def __new__(cls_meta, cls_name, cls_bases, cls_attrs, **kwargs):
-        member_type = collections.namedtuple(f"_{cls_name}_member", ["name", "value"])
-        for (key, value) in kwargs.items():
-            setattr(member_type, key, value)
+        member_type = type(f"_{cls_name}_member", (_EnumMember,), {"__slots__": (), **kwargs})
 
         member_map = dict()
 
         value_map = dict()
         for (key, value) in cls_attrs.items():
-            if key[0] == "_" or isinstance(value, classmethod):
+            if key[0] == "_" or builtins_isinstance(value, classmethod):
                 continue
 
             try:
@@ -1,3 +1,6 @@
+import array
+import bisect
+import builtins
 import re
 import string
 import unicodedata
@@ -253,7 +256,183 @@ def normalize(s):
     return s
 
 
+# NOTE: each character of an ASCII string without control characters
+#       is a cluster of one column, see len.
+_ascii_control = re.compile(r"[\x00-\x1F\x7F]")
+
+_not_printable_ascii = re.compile(r"[^\x20-\x7E]")
+
+# NOTE: str.isascii requires Python 3.7.
+_str_isascii = hasattr(str, "isascii")
+
+
+class WidthIndex:
+    """
+    Represents an index of the display widths of a string.
+
+    The string is split into clusters, each of which is a character
+    and the zero-width characters following it, and the column at
+    which each cluster starts is stored, so that the queries of the
+    index take O(log n) time instead of the O(n) time of calling
+    :func:`~.len` on substrings. Building the index takes O(n) time,
+    and a string in which each character is a cluster of one column,
+    such as printable ASCII, is indexed without measuring its
+    characters; ``offsets`` and ``columns`` are then the same array.
+
+    .. note::
+
+        The string passed to this class should be
+        :attr:`normalized <normalize>`.
+
+    Parameters
+    ----------
+    s: :class:`str`
+        The string to index.
+
+
+    Attributes
+    ----------
+    columns: :class:`array.array`
+        The column at which each cluster starts, followed by the width
+        of the string.
+    offsets: :class:`array.array`
+        The index of the first character of each cluster, followed by
+        the length of the string.
+    string: :class:`str`
+        The indexed string.
+
+    Examples
+    --------
+
+    .. code-block:: python3
+
+        >>> index = WidthIndex("\u65E5\u672C\u8A9E text")
+        >>> index.width
+        11
+
+        >>> index.column(2)
+        4
+
+        >>> index.index(3)
+        1
+
+        >>> index.fit(5)
+        2
+    """
+
+    __slots__ = ("columns", "offsets", "string")
+
+    def __init__(self, s):
+        if _str_isascii:
+            ascii = s.isascii() and not _ascii_control.search(s)
+        else:
+            ascii = not _not_printable_ascii.search(s)
+
+        if ascii:
+            offsets = array.array("I", range(builtins.len(s) + 1))
+            columns = offsets
+        else:
+            offsets = array.array("I")
+            columns = array.array("I", [0])
+            column = 0
+
+            for (i, c) in enumerate(s):
+                n = len(c)
+
+                if not n and offsets:
+                    continue
+
+                offsets.append(i)
+
+                column += n
+                columns.append(column)
+
+            offsets.append(builtins.len(s))
+
+        self.columns = columns
+        self.offsets = offsets
+        self.string = s
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} width={self.width}>"
+
+    @property
+    def width(self):
+        """
+        The width of the string.
+
+        :type: :class:`int`
+        """
+
+        return self.columns[-1]
+
+    def _cluster(self, i):
+        return bisect.bisect_right(self.offsets, i) - 1
+
+    def column(self, i):
+        """
+        Calculates the column at which a character is displayed.
+        Zero-width characters are displayed with the character before
+        them.
+
+        Parameters
+        ----------
+        i: :class:`int`
+            The index of the character, in the range
+            ``[0..len(string)]``.
+
+        Returns
+        -------
+        :class:`int`
+            The column.
+        """
+
+        return self.columns[self._cluster(i)]
+
+    def index(self, column):
+        """
+        Calculates the index of the character displayed at a column.
+
+        Parameters
+        ----------
+        column: :class:`int`
+            The column. Columns past the end of the string map to
+            ``len(string)``.
+
+        Returns
+        -------
+        :class:`int`
+            The index of the character.
+        """
+
+        return self.offsets[max(bisect.bisect_right(self.columns, column) - 1, 0)]
+
+    def fit(self, w, start=0):
+        """
+        Calculates how many characters fit in a number of columns,
+        without splitting a cluster.
+
+        Parameters
+        ----------
+        w: :class:`int`
+            The number of columns.
+        start: :class:`int`
+            The index of the first character.
+
+        Returns
+        -------
+        :class:`int`
+            The number of characters.
+        """
+
+        i = self._cluster(start)
+        j = bisect.bisect_right(self.columns, self.columns[i] + w, i) - 1
+
+        return max(self.offsets[j] - start, 0)
+
+
 __all__ = [
+    "WidthIndex",
     "decimal_to_latin",
     "decimal_to_roman",
     "len",
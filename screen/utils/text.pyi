@@ -1,4 +1,20 @@
+import array
+
+
 def decimal_to_latin(d: int) -> str: ...
 def decimal_to_roman(d: int) -> str: ...
 def len(s: str) -> int: ...
 def normalize(s: str) -> str: ...
+
+
+class WidthIndex:
+    columns: array.array
+    offsets: array.array
+    string: str
+
+    def __init__(self, s: str) -> None: ...
+    @property
+    def width(self) -> int: ...
+    def column(self, i: int) -> int: ...
+    def index(self, column: int) -> int: ...
+    def fit(self, w: int, start: int=...) -> int: ...
@@ -39,6 +39,7 @@ packages = [
     "screen.controls",
     "screen.controls.primitives",
     "screen.drawing",
+    "screen.rendering",
     "screen.utils",
 ]
 
@@ -0,0 +1,36 @@
+import unittest
+
+from screen.rendering import Buffer, diff_buffers
+
+
+class BufferTest(unittest.TestCase):
+    def test_write_after_wide_character(self):
+        buffer = Buffer(1, 4)
+        buffer.view().write(0, 0, "中中")
+        buffer.view().write(0, 1, "ab")
+
+        self.assertEqual(list(buffer.characters), [32, ord("a"), ord("b"), 32])
+        self.assertEqual(buffer.lines(), [" ab "])
+        self.assertIn(" ab ", diff_buffers(None, buffer))
+
+    def test_write_before_wide_character(self):
+        buffer = Buffer(1, 4)
+        buffer.view().write(0, 0, "中中")
+        buffer.view().write(0, 0, "x")
+
+        self.assertEqual(list(buffer.characters), [ord("x"), 32, 0x4E2D, 0])
+        self.assertEqual(buffer.lines(), ["x 中"])
+
+    def test_blit_wide_characters(self):
+        source = Buffer(1, 4)
+        source.view().write(0, 0, "中中")
+
+        buffer = Buffer(1, 4)
+        buffer.view().write(0, 0, "中中")
+        buffer.view().blit(source.view(0, 1, 1, 2), 0, 1)
+
+        self.assertEqual(list(buffer.characters), [32, 32, 32, 32])
+
+
+if __name__ == "__main__":
+    unittest.main()
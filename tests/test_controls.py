@@ -0,0 +1,136 @@
+import unittest
+
+from screen.controls import Border, Stack, Text, property
+
+
+class InitTest(unittest.TestCase):
+    def test_subclass_init(self):
+        class CustomText(Text):
+            extra = property(int, 5, True, True, True)
+
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+
+        text = CustomText(content="hi", extra=3)
+
+        self.assertEqual(text.content, "hi")
+        self.assertEqual(text.extra, 3)
+        self.assertEqual(CustomText(content="hi").extra, 5)
+
+    def test_subclass_without_init(self):
+        class CustomBorder(Border):
+            extra = property(int, 5, True, True, True)
+
+        border = CustomBorder(child=Text(content="hi"), extra=3)
+
+        self.assertEqual(border.extra, 3)
+
+    def test_init_compiled_on_first_instantiation(self):
+        class BaseText(Text):
+            pass
+
+        class CustomText(BaseText):
+            extra = property(int, 5, True, True, True)
+
+        self.assertNotIn("validate_content", BaseText.__init__.__globals__)
+
+        self.assertEqual(CustomText(content="hi", extra=3).extra, 3)
+        self.assertEqual(BaseText(content="hi").content, "hi")
+
+        self.assertIs(BaseText.__init__, BaseText.__control_init__)
+        self.assertIn("validate_content", BaseText.__init__.__globals__)
+
+
+class AssignTest(unittest.TestCase):
+    def test_assign_equal_child(self):
+        border = Border(child=Text(content="x"))
+        child = Text(content="x")
+
+        before = border.measure(None, None)
+        border.child = child
+
+        self.assertIs(border.child, child)
+        self.assertIs(child.parent, border)
+
+        child.content = "xyz"
+
+        self.assertEqual(border.measure(None, None), (before[0], before[1] + 2))
+
+    def test_assign_equal_children(self):
+        stack = Stack(children=[Text(content="x")])
+        child = Text(content="x")
+
+        stack.children = [child]
+
+        self.assertIs(stack.children[0], child)
+        self.assertIs(child.parent, stack)
+
+        other = Text(content="x")
+        stack.update(children=[other])
+
+        self.assertIs(stack.children[0], other)
+        self.assertIs(other.parent, stack)
+        self.assertIsNone(child.parent)
+
+    def test_assign_same_children(self):
+        children = [Text(content="x")]
+        stack = Stack(children=children)
+        version = stack._render_version
+
+        stack.children = children
+        stack.update(children=list(stack.children))
+
+        self.assertEqual(stack._render_version, version)
+
+
+class UpdateTest(unittest.TestCase):
+    def test_update_without_parent(self):
+        class TitledText(Text):
+            title = property(str, None, False, True, True)
+
+        text = TitledText(content="a", title="b")
+
+        for changes in (
+            {"content": "c", "title": 1},
+            {"title": "d", "content": 1},
+            {"content": "c", "missing": 1},
+        ):
+            with self.assertRaises((TypeError, ValueError)):
+                text.update(foreground=None, **changes)
+
+            self.assertEqual((text.content, text.title), ("a", "b"))
+
+        text.update(content="c", title="d")
+
+        self.assertEqual((text.content, text.title), ("c", "d"))
+
+    def test_update_invalidates_ancestors_once(self):
+        text = Text(content="a")
+        stack = Stack(children=[Stack(children=[text])])
+        version = stack._render_version
+
+        text.update(content="b", layer=1, padding=None)
+
+        self.assertEqual(stack._render_version, version + 1)
+        self.assertEqual((text.content, text.layer), ("b", 1))
+
+
+class ValidateTest(unittest.TestCase):
+    def test_sample(self):
+        class SampledStack(Stack, validate=2):
+            pass
+
+        children = [Text(content=str(i)) for i in range(5)]
+
+        self.assertEqual(SampledStack(children=children).children, children)
+
+    def test_non_positive_sample(self):
+        for validate in (0, -1):
+            with self.assertRaises(ValueError):
+
+                class SampledStack(Stack, validate=validate):
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from screen.drawing import Color
+from screen.rendering import Buffer, diff_buffers
+
+
+class DiffBuffersTest(unittest.TestCase):
+    def test_transparent_colors(self):
+        buffer = Buffer(1, 2)
+        buffer.view().write(0, 0, "a", foreground=Color.red, background=Color.transparent)
+        buffer.view().write(0, 1, "b", foreground=Color.transparent, background=Color.blue)
+
+        output = diff_buffers(None, buffer)
+
+        self.assertIn("\x1B[0;38;2;128;0;0ma", output)
+        self.assertIn("\x1B[0;48;2;0;0;128mb", output)
+        self.assertNotIn("255;255;255", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from screen.controls import Control, Instrumentation, Stack, Text, property
+from screen.utils import CachePolicy, LRUCache
+
+
+class Label(Text):
+    measure_cache_policy = CachePolicy(1)
+    render_cache_policy = CachePolicy(1)
+    shared_render_cache = LRUCache(16)
+
+
+class TaggedText(Text):
+    tag = property(int, 0, True, False, False)
+    title = property(int, 0, True, lambda b, a: b // 10 != a // 10, False)
+
+
+class InstrumentationTest(unittest.TestCase):
+    def test_counters(self):
+        measure = Control.measure
+        render = Control.render
+
+        with Instrumentation() as instrumentation:
+            label = Label(content="hello")
+
+            label.measure(None, 10)
+            label.measure(None, 10)
+            label.measure(None, 20)
+
+            list(label.render(1, 10))
+            list(label.render(1, 10))
+            list(Label(content="hello").render(1, 10))
+            list(label.render(1, 20))
+
+            label.content = "bye"
+
+        counters = instrumentation.snapshot()[f"{__name__}.Label"]
+
+        self.assertEqual(counters["measure"]["hits"], 1)
+        self.assertEqual(counters["measure"]["misses"], 2)
+        self.assertEqual(counters["measure"]["evictions"], 1)
+        self.assertEqual(counters["render"]["hits"], 1)
+        self.assertEqual(counters["render"]["shared_hits"], 1)
+        self.assertEqual(counters["render"]["misses"], 2)
+        self.assertEqual(counters["render"]["evictions"], 1)
+        self.assertEqual(counters["invalidations"], {"content": 1})
+
+        self.assertIs(Control.measure, measure)
+        self.assertIs(Control.render, render)
+
+    def test_nested(self):
+        with Instrumentation() as instrumentation:
+            stack = Stack(children=[Text(content="a"), Text(content="b")])
+            stack.measure(None, None)
+            stack.measure(None, None)
+
+        snapshot = instrumentation.snapshot()
+
+        self.assertEqual(snapshot["screen.controls.stack.Stack"]["measure"]["misses"], 1)
+        self.assertEqual(snapshot["screen.controls.stack.Stack"]["measure"]["hits"], 1)
+        self.assertEqual(snapshot["screen.controls.text.Text"]["measure"]["misses"], 2)
+
+    def test_invalidations(self):
+        with Instrumentation() as instrumentation:
+            text = TaggedText(content="a")
+
+            text.tag = 1
+            text.title = 1
+            text.title = 12
+            text.update(tag=2, title=13)
+            text.update(content="b", title=23)
+            text.foreground = None
+
+        counters = instrumentation.snapshot()[f"{__name__}.TaggedText"]
+
+        self.assertEqual(counters["invalidations"], {"content": 1, "title": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import asyncio
+import unittest
+
+from screen.controls import Text
+from screen.rendering import run
+
+
+class _Writer:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+class RunnerTest(unittest.TestCase):
+    def test_flush_on_stop(self):
+        async def main():
+            text = Text(content="before")
+            writer = _Writer()
+            stop = asyncio.Event()
+
+            task = asyncio.ensure_future(run(text, writer, 1, 10, fps=1, stop=stop))
+            await asyncio.sleep(0.05)
+
+            text.content = "after"
+            stop.set()
+            await task
+
+            return writer.data.decode()
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            output = loop.run_until_complete(main())
+        finally:
+            loop.close()
+
+        self.assertIn("before", output)
+        self.assertIn("after", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
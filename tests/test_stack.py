@@ -0,0 +1,48 @@
+import unittest
+
+from screen.controls import Stack, Text
+from screen.controls.primitives import Orientation
+
+
+class StackTest(unittest.TestCase):
+    def test_locate_after_child_changes(self):
+        stack = Stack(
+            children=[Text(content="a"), Text(content="b")],
+            orientation=Orientation.vertical,
+        )
+
+        self.assertEqual(stack.locate(None, 10, 1), (1, 1))
+
+        stack.children[0].content = "x\ny\nz"
+
+        self.assertEqual(stack.locate(None, 10, 1), (0, 0))
+        self.assertEqual(stack.locate(None, 10, 3), (1, 3))
+
+    def test_children_lookup_by_identity(self):
+        cells = [Text(content="cell") for _ in range(50)]
+        stack = Stack(children=cells)
+        new = Text(content="new")
+
+        self.assertEqual(stack.children.index(cells[42]), 42)
+        self.assertEqual(stack.children.count(cells[42]), 1)
+        self.assertNotIn(Text(content="cell"), stack.children)
+
+        stack.children.replace(cells[42], new)
+
+        self.assertIs(stack.children[42], new)
+        self.assertIs(stack.children[0], cells[0])
+        self.assertIs(cells[0].parent, stack)
+        self.assertIsNone(cells[42].parent)
+
+        stack.children.remove(cells[7])
+
+        self.assertIs(stack.children[0], cells[0])
+        self.assertIs(stack.children[7], cells[8])
+        self.assertIsNone(cells[7].parent)
+
+        with self.assertRaises(ValueError):
+            stack.children.remove(cells[7])
+
+
+if __name__ == "__main__":
+    unittest.main()
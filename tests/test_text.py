@@ -0,0 +1,37 @@
+import re
+import unittest
+
+from screen.controls import Text
+from screen.controls.primitives import Boundary, HorizontalAlignment, VerticalAlignment
+
+
+_control = re.compile(r"[\x00-\x1F\x7F-\x9F]")
+
+
+class TextTest(unittest.TestCase):
+    def test_paragraphs(self):
+        text = Text(content="hello\nworld")
+
+        self.assertEqual(text.measure(None, 8), (2, 5))
+        self.assertEqual(list(text.render(2, 8)), ["hello   ", "world   "])
+
+    def test_no_control_characters(self):
+        contents = ["hello\nworld", "a\r\nb\rc\n\nd", "tab\tstop\vvertical", "x\by\x7Fz"]
+
+        for content in contents:
+            for alignment in HorizontalAlignment:
+                for boundary in Boundary:
+                    text = Text(
+                        content=content,
+                        horizontal_text_alignment=alignment,
+                        vertical_text_alignment=VerticalAlignment.center,
+                        wrap_boundary=boundary,
+                    )
+
+                    for w in (1, 3, 8, 20):
+                        for row in text.render(6, w):
+                            self.assertIsNone(_control.search(row), (content, alignment, row))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import random
+import sys
+import threading
+import unittest
+
+from screen.controls import Stack, Text
+from screen.controls.primitives import Orientation
+from screen.utils import CacheBudget, CachePolicy, LRUCache
+
+
+_render_budget = CacheBudget(2000)
+_shared_budget = CacheBudget(4000)
+
+
+class Cell(Text):
+    measure_cache_policy = CachePolicy(4)
+    render_cache_policy = CachePolicy(4, budget=_render_budget)
+    shared_render_cache = LRUCache(64, budget=_shared_budget)
+
+
+class ThreadingTest(unittest.TestCase):
+    def setUp(self):
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+
+    def test_render_during_modification(self):
+        # NOTE: each thread measures and renders its own subtree while
+        #       the main thread modifies the cells of every subtree, and
+        #       the caches are checked against uncached values after.
+        groups = [[Cell(content=f"g{g}i{i}") for i in range(20)] for g in range(8)]
+        stacks = [Stack(children=group) for group in groups]
+        Stack(children=stacks)
+
+        stop = threading.Event()
+        errors = list()
+
+        def work(k):
+            try:
+                while not stop.is_set():
+                    for cell in groups[k]:
+                        w = random.randint(3, 12)
+
+                        cell.measure(None, w)
+                        list(cell.render(1, w))
+                        list(cell.render_rows(1, w, 0, 1))
+
+                    stacks[k].measure(None, 40)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(k,)) for k in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            for _ in range(3000):
+                cell = random.choice(random.choice(groups))
+                cell.content = "x" * random.randint(1, 15)
+        finally:
+            stop.set()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+
+        for group in groups:
+            for cell in group:
+                for w in range(3, 13):
+                    rows = list(cell.render_core(1, w))
+
+                    self.assertEqual(cell.measure(None, w), cell.measure_core(None, w))
+                    self.assertEqual(list(cell.render(1, w)), rows)
+                    self.assertEqual(list(cell.render_rows(1, w, 0, 1)), rows)
+
+        for budget in (_render_budget, _shared_budget):
+            self.assertEqual(budget.nbytes, sum(budget._sizes.values()))
+
+    def test_render_overlapping_modification(self):
+        # NOTE: a render which started before a modification must not
+        #       be shared with structurally equal controls.
+        paused = threading.Event()
+        resume = threading.Event()
+
+        class Paused(Cell):
+            shared_render_cache = LRUCache(16)
+
+            def render_core(self, h, w):
+                if threading.current_thread() is not threading.main_thread():
+                    paused.set()
+                    resume.wait()
+
+                return super().render_core(h, w)
+
+        a = Paused(content="old")
+        b = Paused(content="old")
+
+        thread = threading.Thread(target=lambda: list(a.render(1, 5)))
+        thread.start()
+
+        paused.wait()
+        a.content = "new"
+        resume.set()
+        thread.join()
+
+        self.assertEqual(list(a.render(1, 5)), ["new  "])
+        self.assertEqual(list(b.render(1, 5)), ["old  "])
+
+    def test_layout_shared_frozen_stack(self):
+        # NOTE: the snapshots of two roots share the snapshot of an
+        #       unmodified virtualized stack, which each thread lays
+        #       out through its own root.
+        cells = [Cell(content="x" * (i % 7 + 1)) for i in range(2000)]
+        stack = Stack(children=cells, orientation=Orientation.vertical, virtualized=True)
+        root = Stack(children=[stack])
+
+        first = root.snapshot()
+        root.spacing = 1
+        second = root.snapshot()
+
+        shared = first.children[0]
+        self.assertIs(second.children[0], shared)
+
+        barrier = threading.Barrier(8)
+        errors = list()
+
+        def work(root):
+            # NOTE: every thread lays out the same ranges in the same
+            #       order, so they measure the same children at once.
+            try:
+                stack = root.children[0]
+                barrier.wait()
+
+                for offset in range(0, 8000, 16):
+                    stack.visible_children(None, 3, offset, 32)
+                    stack.locate(None, 3, offset)
+                    stack.measure(None, 3)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(root,)) for root in [first, second] * 4]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+        extents = shared._extents[3]
+        tree = extents.tree
+
+        for (i, child) in enumerate(shared.children):
+            self.assertEqual(tree.prefix(i + 1) - tree.prefix(i), tree[i])
+
+            if extents.measured[i]:
+                self.assertEqual(tree[i], child.layout_size(None, 3)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()